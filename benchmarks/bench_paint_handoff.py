@@ -0,0 +1,153 @@
+#-*- encoding: utf-8 -*-
+
+"""Compare the temp PNG hand-off with the in-memory QImage hand-off.
+
+Each path runs in its own process so the peak memory numbers don't leak
+into each other:
+
+    python benchmarks/bench_paint_handoff.py --iterations 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PATHS = ("tempfile", "memory")
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(),
+            ctypes.byref(counters),
+            counters.cb
+        )
+        return counters.PeakWorkingSetSize
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build_page():
+    """Build a page the same size as handle_paint_request does"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new('RGB', (3508, 2480), 'white')
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    for y in range(130, 2400, 55):
+        draw.text((2800, y), "富士山 300 り 8888 AA100A-1001001", fill="black", font=font)
+    return image
+
+
+def handoff_tempfile(image):
+    """The original path: encode to a temp PNG and decode it into a QPixmap"""
+    from PySide6.QtGui import QPixmap
+
+    temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+    try:
+        image.save(temp_file.name)
+        temp_file.close()
+        return QPixmap(temp_file.name)
+    finally:
+        os.unlink(temp_file.name)
+
+
+def handoff_memory(image):
+    """The in-memory path used by handle_paint_request"""
+    from carform import pil_to_qimage
+
+    return pil_to_qimage(image)
+
+
+def run_path(path, iterations):
+    """Time one hand-off path and print the result as JSON"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    import carform  # Same module imports for both paths
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    handoff = handoff_tempfile if path == "tempfile" else handoff_memory
+
+    image = build_page()
+    baseline_rss = peak_rss_bytes()
+    # Warm up once so plugin loading isn't counted in the timings
+    handoff(image)
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = handoff(image)
+        timings.append((time.perf_counter() - start) * 1000)
+        result = None
+
+    print(json.dumps({
+        "path": path,
+        "iterations": iterations,
+        "mean_ms": sum(timings) / len(timings),
+        "min_ms": min(timings),
+        "peak_rss_mb": peak_rss_bytes() / (1024 * 1024),
+        "extra_peak_mb": (peak_rss_bytes() - baseline_rss) / (1024 * 1024),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--run", choices=PATHS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_path(args.run, args.iterations)
+        return
+
+    results = {}
+    for path in PATHS:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run", path,
+             "--iterations", str(args.iterations)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results[path] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'path':<10} {'mean ms':>10} {'min ms':>10} {'peak MB':>10} {'extra MB':>10}")
+    for path in PATHS:
+        r = results[path]
+        print(f"{path:<10} {r['mean_ms']:>10.1f} {r['min_ms']:>10.1f} "
+              f"{r['peak_rss_mb']:>10.1f} {r['extra_peak_mb']:>10.1f}")
+
+    speedup = results["tempfile"]["mean_ms"] / results["memory"]["mean_ms"]
+    print(f"\nin-memory hand-off is {speedup:.1f}x faster than the temp PNG path")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#-*- encoding: utf-8 -*-
+
+"""Measure cold start time and fail when it goes over budget.
+
+Two numbers are checked:
+
+* time to first window: wall time from launching the interpreter until
+  the CarForm window has been shown and painted once
+* import time: the sum of all module import times reported by
+  ``python -X importtime -c "import carform"``
+
+    python benchmarks/bench_startup.py --runs 5 --window-budget-ms 1500
+
+Exits with status 1 when the median of either number is over budget.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Shows the window, lets it paint once and quits
+FIRST_WINDOW_SCRIPT = """
+import sys
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+import carform
+app = QApplication(sys.argv[:1])
+window = carform.CarForm()
+window.show()
+QTimer.singleShot(0, app.quit)
+app.exec()
+print("shown", flush=True)
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def child_env(offscreen):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    if offscreen:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def time_to_first_window(env):
+    """Wall time in ms for one cold start up to the first shown window"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_WINDOW_SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0 or "shown" not in result.stdout:
+        raise RuntimeError(f"startup failed:\n{result.stderr}")
+    return elapsed
+
+
+def import_times(env):
+    """Return (total ms, [(cumulative ms, module)] for carform and its direct imports)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import carform"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import failed:\n{result.stderr}")
+
+    total_us = 0
+    direct = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        total_us += int(self_us)
+        # One leading space marks a top-level import, each level adds two
+        if len(indent) <= 3:
+            direct.append((int(cumulative_us) / 1000, module))
+    return total_us / 1000, sorted(direct, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--window-budget-ms", type=float, default=1500)
+    parser.add_argument("--import-budget-ms", type=float, default=400)
+    parser.add_argument("--onscreen", action="store_true", help="Use the real Qt platform plugin")
+    args = parser.parse_args()
+
+    env = child_env(not args.onscreen)
+
+    # The first run pays for cold disk caches, keep it out of the median
+    time_to_first_window(env)
+    window_ms = statistics.median(time_to_first_window(env) for _ in range(args.runs))
+
+    runs = [import_times(env) for _ in range(args.runs)]
+    import_ms = statistics.median(total for total, _ in runs)
+
+    print(f"time to first window: {window_ms:8.1f} ms (budget {args.window_budget_ms:.0f} ms)")
+    print(f"import time total:    {import_ms:8.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print("\nslowest imports:")
+    for cumulative_ms, module in runs[-1][1][:10]:
+        print(f"  {cumulative_ms:8.1f} ms  {module}")
+
+    over = []
+    if window_ms > args.window_budget_ms:
+        over.append("time to first window")
+    if import_ms > args.import_budget_ms:
+        over.append("import time")
+    if over:
+        print(f"\nOVER BUDGET: {', '.join(over)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
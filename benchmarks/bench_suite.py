@@ -0,0 +1,215 @@
+#-*- encoding: utf-8 -*-
+
+"""Time the hot paths of CarForm and compare them with a stored baseline.
+
+Runs headless on the offscreen Qt platform, in a scratch directory so the
+settings, history and journal files of a real install are not touched:
+
+    python benchmarks/bench_suite.py                    # compare with the baseline
+    python benchmarks/bench_suite.py --update-baseline  # record a new baseline
+    python benchmarks/bench_suite.py -k paint           # only matching benchmarks
+
+Exits with status 1 when a median is more than --threshold percent slower
+than its baseline. Baselines depend on the machine, record them on the
+machine the comparison runs on.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+sys.path.insert(0, ROOT)
+
+# A filled in form with full-width input, as typed on a Japanese keyboard
+FORM_FIELDS = {
+    "Registration number:": "品川　５００　あ　１２３４",
+    "Model number:": "ＡＡ１００Ａ－１００１００１",
+    "Travel distance:": "１２３４５６",
+    "Checked year:": "2025",
+    "Checked month:": "01",
+    "Checked day:": "15",
+    "Maintained year:": "2025",
+    "Maintained month:": "02",
+    "Maintained day:": "20",
+}
+LOOKED_ITEMS = ["ブレーキパッド", "エンジンオイル", "タイヤ空気圧", "ワイパーブレード"]
+PARTS_REPLACEMENT = ["オイルフィルター", "エアクリーナー"]
+
+
+def fill_form(window):
+    for label, field in window.form_fields.items():
+        field.setText(FORM_FIELDS.get(label, "1"))
+    window.looked_items.set_values(LOOKED_ITEMS)
+    window.parts_replacement.set_values(PARTS_REPLACEMENT)
+
+
+def pdf_printer(path):
+    from PySide6.QtPrintSupport import QPrinter
+
+    import carform
+
+    printer = carform.create_printer()
+    printer.setOutputFormat(QPrinter.PdfFormat)
+    printer.setOutputFileName(path)
+    return printer
+
+
+def build_benchmarks(window, scratch):
+    """Return {name: (setup, run)}; setup runs untimed before every run"""
+    import carform
+
+    def nothing():
+        pass
+
+    def paint(backend):
+        def setup():
+            carform.preferences.values["print_backend"] = backend
+
+        def run():
+            window.handle_paint_request(pdf_printer(os.path.join(scratch, "bench.pdf")))
+        return setup, run
+
+    def repaint_cached():
+        # What a preview repaint does once its pages are rendered
+        carform.paint_form(
+            pdf_printer(os.path.join(scratch, "bench.pdf")), window.collect_form_data(),
+            {}, carform.current_layout(), "raster", window.render_cache
+        )
+
+    def export_csv():
+        # The CSV is written in the background, time it until it's on disk
+        window.export_csv(os.path.join(scratch, "bench.csv"))
+        window.wait_for_saves()
+
+    long_text = "".join(FORM_FIELDS.values()) * 20
+
+    return {
+        "handle_paint_request[raster]": paint("raster"),
+        "handle_paint_request[vector]": paint("vector"),
+        "paint_form[raster, cached]": (nothing, repaint_cached),
+        "export_csv": (nothing, export_csv),
+        "convert_fullwidth_to_halfwidth": (
+            nothing, lambda: window.convert_fullwidth_to_halfwidth(long_text)
+        ),
+        "check_all_fields_filled": (nothing, window.check_all_fields_filled),
+        "CarForm()": (nothing, lambda: carform.CarForm().deleteLater()),
+    }
+
+
+def measure(setup, run, runs, min_time):
+    """Median ms of run, repeating small runs until each sample takes min_time"""
+    setup()
+    run()  # Warm up caches and lazy imports
+
+    loops = 1
+    while True:
+        setup()
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - start >= min_time or loops >= 100000:
+            break
+        loops *= 10
+
+    samples = []
+    for _ in range(runs):
+        setup()
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - start) * 1000 / loops)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=9)
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="Seconds each sample should take at least")
+    parser.add_argument("--threshold", type=float, default=25,
+                        help="Percent slower than the baseline that counts as a regression")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    scratch = tempfile.mkdtemp(prefix="carform-bench-")
+    # Printing looks fonts up relative to the working directory
+    for name in os.listdir(ROOT):
+        if name.lower().endswith((".ttf", ".ttc", ".otf")):
+            shutil.copy(os.path.join(ROOT, name), scratch)
+    os.chdir(scratch)
+    try:
+        from PySide6.QtWidgets import QApplication, QMessageBox
+
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        # A dialog would block the run, report it instead
+        for name in ("critical", "warning", "information"):
+            setattr(QMessageBox, name, staticmethod(
+                lambda parent, title, text, *rest, _name=name: print(f"{_name}: {text}", file=sys.stderr)
+            ))
+
+        import carform
+
+        window = carform.CarForm()
+        fill_form(window)
+
+        results = {}
+        for name, (setup, run) in build_benchmarks(window, scratch).items():
+            if args.pattern and args.pattern not in name:
+                continue
+            results[name] = measure(setup, run, args.runs, args.min_time)
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({name: {"median_ms": round(ms, 4)} for name, ms in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4, ensure_ascii=False, sort_keys=True)
+            f.write("\n")
+        for name, ms in results.items():
+            print(f"{name:<40} {ms:10.3f} ms")
+        print(f"\nbaseline written to {os.path.relpath(args.baseline, ROOT)}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'benchmark':<40} {'median ms':>10} {'baseline':>10} {'change':>8}")
+    regressions = []
+    for name, ms in results.items():
+        reference = baseline.get(name, {}).get("median_ms")
+        if reference is None:
+            print(f"{name:<40} {ms:10.3f} {'-':>10} {'new':>8}")
+            continue
+        change = (ms - reference) / reference * 100
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {ms:10.3f} {reference:10.3f} {change:+7.1f}%{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) more than {args.threshold:.0f}% slower than the baseline")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
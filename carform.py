@@ -2,24 +2,35 @@
 
 import sys
 import os
-import pandas as pd
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, 
     QPushButton, QVBoxLayout, QHBoxLayout, QGridLayout, QMenuBar, 
     QMenu, QFrame, QSizePolicy, QMessageBox, QFileDialog, QDialog,
-    QCalendarWidget, QProgressBar
+    QCalendarWidget, QProgressBar, QComboBox, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QTableView, QHeaderView, QStyledItemDelegate, QCheckBox, QCompleter,
+    QSpinBox
 )
 from PySide6.QtCore import (
-    Qt, __version__, QSettings, QDate, QSize, QUrl, QTimer
+    Qt, __version__, QSettings, QDate, QSize, QPoint, QPointF, QRect, QUrl, QTimer,
+    QObject, QRunnable, QThreadPool, Signal, QFileSystemWatcher, QAbstractListModel,
+    QModelIndex, QPersistentModelIndex, QStringListModel
 )
 from PySide6.QtGui import (
-    QKeySequence, QPixmap, QPainter, QPageSize, QPageLayout
+    QKeySequence, QPixmap, QPixmapCache, QImage, QPainter, QFont, QFontDatabase, QPageSize, QPageLayout
 )
-from PySide6.QtPrintSupport import (
-    QPrinter, QPrintDialog, QPrintPreviewDialog
-)
-from PIL import Image, ImageDraw, ImageFont
+# PIL and QtPrintSupport are only needed when printing and are imported
+# where they are used to keep startup fast
+import csv
+import hashlib
+import json
+import re
+import sqlite3
 import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque, namedtuple
+from contextlib import nullcontext
 
 # Add at the top of the file with other imports
 import os
@@ -29,31 +40,157 @@ def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS
     except Exception:
-        base_path = os.path.abspath(".")
+        base_path = os.path.dirname(os.path.abspath(__file__))
 
     return os.path.join(base_path, relative_path)
 
+def pil_to_qimage(image):
+    """Wrap a PIL image in a QImage without encoding it to a file
+
+    RGB, grayscale ("L") and bilevel ("1") images keep their bit depth.
+    """
+    # Raw pixel bytes are shared with the QImage, PySide keeps them alive
+    if image.mode == "L":
+        data = image.tobytes("raw", "L")
+        return QImage(data, image.width, image.height, image.width, QImage.Format_Grayscale8)
+    if image.mode == "1":
+        # Rows are packed 8 pixels per byte, most significant bit first, set bits are white
+        data = image.tobytes("raw", "1")
+        qimage = QImage(data, image.width, image.height, (image.width + 7) // 8, QImage.Format_Mono)
+        qimage.setColorTable([0xFF000000, 0xFFFFFFFF])
+        return qimage
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    data = image.tobytes("raw", "RGB")
+    return QImage(data, image.width, image.height, image.width * 3, QImage.Format_RGB888)
+
+def detect_system_theme():
+    """Detect if system is using dark mode"""
+    try:
+        import winreg
+        with winreg.OpenKey(
+            winreg.HKEY_CURRENT_USER,
+            r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize"
+        ) as key:
+            return not winreg.QueryValueEx(key, "AppsUseLightTheme")[0]
+    except:
+        return False  # Default to light mode if detection fails
+
+class Assets:
+    """Icon and logos served from the compiled Qt resources, scaled once and cached"""
+    def __init__(self):
+        self.compiled = None
+        self.dark = None
+
+    def path(self, name):
+        """Return where QPixmap loads an asset from"""
+        if self.compiled is None:
+            try:
+                import carform_rc  # Registers the :/assets resources
+                self.compiled = True
+            except ImportError:
+                # Running from a checkout where carform.qrc wasn't compiled
+                self.compiled = False
+        return f":/assets/{name}" if self.compiled else resource_path(name)
+
+    def pixmap(self, name, width=None, height=None):
+        """Return an asset scaled to fit width x height, kept in QPixmapCache"""
+        key = f"carform/{name}/{width}x{height}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QPixmap(self.path(name))
+            if width is not None:
+                pixmap = pixmap.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def dark_theme(self):
+        """Whether the system uses dark mode, looked up once until theme_changed"""
+        if self.dark is None:
+            self.dark = detect_system_theme()
+        return self.dark
+
+    def theme_changed(self):
+        self.dark = None
+
+    def logo(self, width, height):
+        """The CarForm logo for the current theme"""
+        if self.dark_theme():
+            return self.pixmap("Darkmode_CarForm_logo.png", width, height)
+        return self.pixmap("Lightmode_CarForm_logo.png", width, height)
+
+assets = Assets()
+
+# Windows messages broadcast when a printer's settings or the default printer change
+WM_SETTINGCHANGE = 0x001A
+WM_DEVMODECHANGE = 0x001B
+
 class PrintHandler:
+    """The printer and print preview of a window, created once and reused"""
     def __init__(self, parent):
         self.parent = parent
+        self.printer = None
+        self.preview = None
+        self.stale = False
+    
+    def session(self):
+        """Return (printer, preview), creating them on first use"""
+        from PySide6.QtPrintSupport import QPrintDialog, QPrintPreviewDialog
+        
+        if self.preview is None:
+            # Creating the first printer enumerates the printer drivers
+            with metrics.phase("print.session"):
+                # Create printer with fixed A4 Landscape settings
+                self.printer = create_printer()
+                
+                # Create preview dialog with native dialogs disabled
+                self.preview = QPrintPreviewDialog(self.printer, self.parent)
+                self.preview.setWindowFlags(Qt.Window | Qt.WindowCloseButtonHint)  # Custom window flags
+                self.preview.paintRequested.connect(self.parent.handle_paint_request)
+                self.preview.setWindowTitle("Print Preview")  # Custom title
+                
+                # Set options for all print dialogs in the preview
+                for dialog in self.preview.findChildren(QPrintDialog):
+                    dialog.setOption(QPrintDialog.PrintToFile)
+        return self.printer, self.preview
+    
+    def warm_up(self):
+        """Create the session before the first print needs it"""
+        self.session()
+    
+    def invalidate(self):
+        """Drop the session after the printer setup changed"""
+        if self.preview is None:
+            return
+        if self.preview.isVisible():
+            self.stale = True  # Dropped once the preview closes
+            return
+        preview, self.preview = self.preview, None
+        # Delete the dialog now, before the printer it points to
+        preview.setParent(None)
+        del preview
+        self.printer = None
+        self.stale = False
     
     def print_preview(self):
-        # Create printer with fixed A4 Landscape settings
-        printer = QPrinter(QPrinter.HighResolution)
+        from PySide6.QtPrintSupport import QPrintPreviewWidget
+        
+        opened = metrics.timer("dialog.print_preview")
+        if self.printer is not None and not self.printer.isValid():
+            self.invalidate()  # The printer went away
+        printer, preview = self.session()
+        # Keep A4 Landscape even if the last print changed it
         printer.setPageOrientation(QPageLayout.Landscape)
         printer.setPageSize(QPageSize(QPageSize.A4))
+        # A preview paints itself when first shown, after that only when asked to
+        preview_widget = preview.findChild(QPrintPreviewWidget)
+        if preview_widget.pageCount():
+            preview_widget.updatePreview()
         
-        # Create and show preview dialog with native dialogs disabled
-        preview = QPrintPreviewDialog(printer, self.parent)
-        preview.setWindowFlags(Qt.Window | Qt.WindowCloseButtonHint)  # Custom window flags
-        preview.paintRequested.connect(self.parent.handle_paint_request)
-        preview.setWindowTitle("Print Preview")  # Custom title
-        
-        # Set options for all print dialogs in the preview
-        for dialog in preview.findChildren(QPrintDialog):
-            dialog.setOption(QPrintDialog.PrintToFile)
-        
+        QTimer.singleShot(0, opened)  # Runs once the preview is shown
         preview.exec()
+        if self.stale:
+            self.invalidate()
 
 from PySide6.QtCore import QSettings
 
@@ -63,99 +200,1642 @@ organization_name = "amaterasuqbb"
 QSettings.setDefaultFormat(QSettings.IniFormat)
 QSettings.setPath(QSettings.IniFormat, QSettings.UserScope, ".")
 
-class FieldGroup(QFrame):
-    def __init__(self, base_label: str, count: int):
+class Preferences(QObject):
+    """Settings read once and served from memory
+
+    Writes go through set_many, which flushes the INI file once per batch.
+    Changes made by another instance are picked up once watch() is called.
+    """
+
+    changed = Signal(list)  # Keys whose values changed
+
+    def __init__(self):
         super().__init__()
-        self.setFrameStyle(QFrame.StyledPanel)
-        self.layout = QVBoxLayout(self)
-        self.layout.setSpacing(2)
-        self.layout.setContentsMargins(5, 5, 5, 5)
-        self.fields = []
-        self.visible_count = 1
-        
-        # Calculate label width for alignment
-        max_label_width = max(len(f"{base_label}{i+1 if i > 0 else ''}:") for i in range(count))
-        
-        for i in range(count):
-            container = QWidget()
-            item_layout = QHBoxLayout(container)
-            item_layout.setSpacing(5)
-            item_layout.setContentsMargins(0, 0, 0, 0)
-            
-            label = QLabel(f"{base_label}{i+1 if i > 0 else ''}:")
-            # Set fixed width for labels to align fields
-            label.setMinimumWidth(100)
-            
-            field = QLineEdit()
-            field.setMinimumWidth(200)  # Set minimum width for consistent sizing
-            add_btn = QPushButton("Add")
-            remove_btn = QPushButton("Remove")
-            
-            # Set size policies
-            field.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            add_btn.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            remove_btn.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            
-            # Set fixed sizes for buttons
-            add_btn.setFixedWidth(60)
-            remove_btn.setFixedWidth(60)
-            
-            # Set fixed heights
-            field.setFixedHeight(25)
-            add_btn.setFixedHeight(25)
-            remove_btn.setFixedHeight(25)
-            
-            # Disable remove button for the first item
-            if i == 0:
-                remove_btn.setEnabled(False)
-            
-            item_layout.addWidget(label)
-            item_layout.addWidget(field)
-            item_layout.addWidget(add_btn)
-            item_layout.addWidget(remove_btn)
-            
-            self.layout.addWidget(container)
-            self.fields.append((container, field, item_layout))
-            
-            add_btn.clicked.connect(lambda checked, idx=i: self.add_field(idx))
-            remove_btn.clicked.connect(lambda checked, idx=i: self.remove_field(idx))
+        self.settings = None
+        self.values = {}
+        self.watcher = None
+
+    def load(self):
+        """(Re)read every key from the settings file"""
+        # Created on first use, after the application and organization names are set
+        if self.settings is None:
+            self.settings = QSettings()
+        self.settings.sync()
+        old = self.values
+        self.values = {key: self.settings.value(key) for key in self.settings.allKeys()}
+        return [key for key in set(old) | set(self.values) if old.get(key) != self.values.get(key)]
+
+    def get(self, key, default=None):
+        """Return the value of key from memory"""
+        if self.settings is None:
+            self.load()
+        return self.values.get(key, default)
+
+    def set_many(self, values):
+        """Write several keys with a single flush, None removes a key"""
+        if self.settings is None:
+            self.load()
+        changed = [key for key, value in values.items() if self.values.get(key) != value]
+        for key in changed:
+            if values[key] is None:
+                self.settings.remove(key)
+                self.values.pop(key, None)
+            else:
+                self.settings.setValue(key, values[key])
+                self.values[key] = values[key]
+        if changed:
+            self.settings.sync()
+            self.changed.emit(changed)
+
+    def directory(self):
+        """Directory of the settings file, where the other app data lives too"""
+        if self.settings is None:
+            self.load()
+        return os.path.dirname(os.path.abspath(self.settings.fileName()))
+
+    def watch(self):
+        """Reload when another instance rewrites the settings file"""
+        if self.settings is None:
+            self.load()
+        if self.watcher is None:
+            self.watcher = QFileSystemWatcher(self)
+            self.watcher.fileChanged.connect(self._file_changed)
+            self.watcher.directoryChanged.connect(self._file_changed)
+        self._watch_file()
+
+    def _watch_file(self):
+        # Atomic rewrites replace the file, which drops it from the watcher.
+        # Until the file exists, watch the directory for it to appear.
+        path = os.path.abspath(self.settings.fileName())
+        directory = os.path.dirname(path)
+        if os.path.exists(path):
+            if path not in self.watcher.files():
+                self.watcher.addPath(path)
+            if directory in self.watcher.directories():
+                self.watcher.removePath(directory)
+        elif os.path.isdir(directory) and directory not in self.watcher.directories():
+            self.watcher.addPath(directory)
+
+    def _file_changed(self, path):
+        self._watch_file()
+        changed = self.load()
+        if changed:
+            self.changed.emit(changed)
+
+preferences = Preferences()
+
+class Phase:
+    """Times one phase of work and records it on exit"""
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.record(self.name, (time.perf_counter() - self.start) * 1000)
+
+class Metrics:
+    """Opt-in timing of hot paths, logged as JSON lines with rolling percentiles
+
+    Enabled by the CARFORM_METRICS environment variable or the
+    metrics_enabled preference. When disabled, phase() returns a shared
+    no-op context manager and timer() a no-op function.
+    """
+
+    WINDOW = 500  # Samples kept per phase for the percentiles
+    NO_PHASE = nullcontext()
+
+    def __init__(self):
+        self.enabled = self.forced()
+        self.path = None
+        self.file = None
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def configure(self, enabled, path=None):
+        """Turn recording on or off, logging to path"""
+        with self.lock:
+            self.enabled = bool(enabled) or self.forced()
+            if path != self.path and self.file is not None:
+                self.file.close()
+                self.file = None
+            self.path = path
+
+    @staticmethod
+    def forced():
+        """Whether CARFORM_METRICS turns recording on regardless of the preference"""
+        return os.environ.get("CARFORM_METRICS", "").strip().lower() not in ("", "0", "false", "no", "off")
+
+    def phase(self, name):
+        """Context manager timing the enclosed block as name"""
+        return Phase(self, name) if self.enabled else self.NO_PHASE
+
+    def timer(self, name):
+        """Start timing name now, return a function that records it when called"""
+        if not self.enabled:
+            return lambda: None
+        start = time.perf_counter()
+        return lambda: self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name, ms):
+        """Log one measurement in milliseconds"""
+        line = json.dumps({"time": time.time(), "pid": os.getpid(), "phase": name, "ms": round(ms, 3)})
+        with self.lock:
+            self.samples.setdefault(name, deque(maxlen=self.WINDOW)).append(ms)
+            try:
+                if self.file is None:
+                    path = self.path or os.path.join(preferences.directory(), "metrics.jsonl")
+                    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                    self.file = open(path, 'a', encoding='utf-8', buffering=1)
+                self.file.write(line + "\n")
+            except OSError:
+                pass  # The in-app percentiles still work
+
+    def summary(self):
+        """Return [(phase, count, p50, p90, p99, max)] over the rolling window"""
+        def percentile(values, fraction):
+            return values[min(len(values) - 1, int(fraction * len(values)))]
+
+        with self.lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+        return [
+            (name, len(values), percentile(values, 0.5), percentile(values, 0.9),
+             percentile(values, 0.99), values[-1])
+            for name, values in sorted(samples.items())
+        ]
+
+metrics = Metrics()
+
+class HalfwidthNormalizer:
+    """Converts full-width characters to half-width while preserving other characters"""
+    def __init__(self):
+        # Full-width ASCII block (！ to ～) sits at a fixed offset from ASCII
+        self.table = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+        self.table[ord('　')] = ' '  # Full-width space
+        # Hyphens, dashes and minus signs
+        self.table.update(str.maketrans('‐‑‒–—―−', '-------'))
+        # Full-width currency and other signs
+        self.table.update(str.maketrans('￠￡￢￣￤￥￦', '¢£¬¯¦¥₩'))
+
+    def normalize(self, text):
+        """Convert a whole string"""
+        return text.translate(self.table)
+
+    def normalize_insertion(self, old_text, new_text):
+        """Convert only what changed between old_text and new_text
+
+        Returns (start, end, replacement) for the span of new_text that
+        needs replacing, or None when nothing needs converting.
+        """
+        prefix = len(os.path.commonprefix([old_text, new_text]))
+        limit = min(len(old_text), len(new_text)) - prefix
+        suffix = 0
+        while suffix < limit and old_text[-1 - suffix] == new_text[-1 - suffix]:
+            suffix += 1
+
+        end = len(new_text) - suffix
+        inserted = new_text[prefix:end]
+        converted = inserted.translate(self.table)
+        if converted == inserted:
+            return None
+        return prefix, end, converted
+
+    def normalize_items(self, items):
+        """Convert every string value of an imported record"""
+        return {
+            name: self.normalize(value) if isinstance(value, str) else value
+            for name, value in items.items()
+        }
+
+    def normalize_form(self, form_data, business_info):
+        """Convert an imported form, after its list columns have been decoded
+
+        Converting the raw JSON of a list column would turn a full-width
+        quote or backslash inside an item into JSON syntax.
+        """
+        return {
+            "fields": self.normalize_items(form_data["fields"]),
+            "looked_items": [self.normalize(text) for text in form_data["looked_items"]],
+            "parts_replacement": [self.normalize(text) for text in form_data["parts_replacement"]]
+        }, self.normalize_items(business_info)
+
+normalizer = HalfwidthNormalizer()
+
+# Main form fields and their placeholders
+FORM_PLACEHOLDERS = {
+    "Registration number:": "富士山 300 り 8888",
+    "Model number:": "AA100A-1001001",
+    "Travel distance:": "0",
+    "Checked year:": "20250101",
+    "Checked month:": "01",
+    "Checked day:": "01",
+    "Maintained year:": "20250202",
+    "Maintained month:": "02",
+    "Maintained day:": "02"
+}
+
+# Preference keys and their names in exported files
+PREFERENCE_ITEMS = [
+    ("business_name", "Business name"),
+    ("address", "Address"),
+    ("phone_number", "Telephone number"),
+    ("cellphone_number", "Cellphone number")
+]
+
+def form_items(form_data, business_info):
+    """Flatten a form into (item, value) rows in export order"""
+    # Preference fields first (A13-B13)
+    rows = [[name, business_info.get(key, "")] for key, name in PREFERENCE_ITEMS]
+
+    for label, text in form_data["fields"].items():
+        rows.append([label.strip(':'), text])
+    for i, text in enumerate(form_data["looked_items"]):
+        rows.append([f"Looked item{i+1 if i > 0 else ''}", text])
+    for i, text in enumerate(form_data["parts_replacement"]):
+        rows.append([f"Parts replacement{i+1 if i > 0 else ''}", text])
+    return rows
+
+def write_form_csv(file_name, rows):
+    """Write one form as an Item/Value CSV
+
+    The rows go to a temp file in the same directory, which is synced and
+    then renamed over the target, so a crash never leaves a truncated file.
+    """
+    directory = os.path.dirname(os.path.abspath(file_name))
+    temp_file = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8-sig', newline='', dir=directory,
+        prefix='.carform-', suffix='.tmp', delete=False
+    )
+    try:
+        with temp_file as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+            # Write header
+            writer.writerow(['Item', 'Value'])
+            # Write data rows
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+        # Temp files are private, keep the permissions a normal save would have
+        try:
+            mode = os.stat(file_name).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_file.name, mode)
+        os.replace(temp_file.name, file_name)
+    except BaseException:
+        try:
+            os.unlink(temp_file.name)
+        except OSError:
+            pass
+        raise
+
+    # Make the rename itself durable where directories can be synced
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def form_data_from_items(items, default_business_info):
+    """Rebuild form data and business info from exported (item, value) pairs"""
+    items = {name: "" if value is None else str(value) for name, value in dict(items).items()}
+
+    def numbered(base_name, list_name):
+        # Bulk exports keep the whole list as JSON in one column
+        if items.get(list_name):
+            return [str(value) for value in json.loads(items[list_name])]
+
+        # "Looked item", "Looked item2", ... in order
+        found = []
+        for name, value in items.items():
+            suffix = name[len(base_name):]
+            if name.startswith(base_name) and (suffix == "" or suffix.isdigit()):
+                found.append((int(suffix or 1), value))
+        values = [value for _, value in sorted(found)]
+        # Wide CSVs pad short lists with empty cells
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    form_data = {
+        "fields": {label: items.get(label.strip(':'), "") for label in FORM_PLACEHOLDERS},
+        "looked_items": numbered("Looked item", "Looked items"),
+        "parts_replacement": numbered("Parts replacement", "Parts replacements")
+    }
+    business_info = {
+        key: items[name] if name in items else default_business_info.get(key, "")
+        for key, name in PREFERENCE_ITEMS
+    }
+    return form_data, business_info
+
+# Japanese fonts tried in order when the layout font isn't installed
+DEFAULT_FONT_FALLBACKS = [
+    "msgothic.ttc", "YuGothR.ttc", "meiryo.ttc",  # Windows
+    "NotoSansCJK-Regular.ttc", "NotoSansCJKjp-Regular.otf", "NotoSansJP-Regular.otf",
+    "ipag.ttf", "ipaexg.ttf", "fonts-japanese-gothic.ttf",  # Linux
+    "ヒラギノ角ゴシック W3.ttc", "Hiragino Sans GB.ttc", "Arial Unicode.ttf"  # macOS
+]
+
+def font_directories():
+    """Return the directories that may contain installed fonts"""
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        return [
+            os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts")
+        ]
+    if sys.platform == "darwin":
+        return [
+            "/System/Library/Fonts", "/System/Library/Fonts/Supplemental",
+            "/Library/Fonts", os.path.join(home, "Library", "Fonts")
+        ]
+    data_dirs = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+    return [os.path.join(d, "fonts") for d in data_dirs] + [
+        os.path.join(home, ".local", "share", "fonts"), os.path.join(home, ".fonts")
+    ]
+
+class FontRegistry:
+    """Loads each print font once and falls back through installed CJK fonts"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.fonts = {}
+        self.resolved = {}
+        self.qt_families = {}
+        self.installed = None
+
+    def fallbacks(self):
+        """Fallback font list, overridable with the font_fallbacks setting"""
+        configured = preferences.get("font_fallbacks", "")
+        if configured:
+            return [name.strip() for name in configured.split(";") if name.strip()]
+        return DEFAULT_FONT_FALLBACKS
+
+    def _installed_fonts(self):
+        # Index font files by name once instead of searching per lookup
+        if self.installed is None:
+            self.installed = {}
+            for directory in font_directories():
+                for root, _, files in os.walk(directory):
+                    for file_name in files:
+                        self.installed.setdefault(file_name.lower(), os.path.join(root, file_name))
+        return self.installed
+
+    def resolve(self, name):
+        """Return the path of the first available font for name, or None"""
+        with self.lock:
+            if name not in self.resolved:
+                path = None
+                for candidate in [name] + self.fallbacks():
+                    if os.path.isfile(candidate):
+                        path = os.path.abspath(candidate)
+                    else:
+                        path = self._installed_fonts().get(os.path.basename(candidate).lower())
+                    if path:
+                        break
+                self.resolved[name] = path
+            return self.resolved[name]
+
+    def get(self, name, size):
+        """Return a cached PIL font for name at size"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            from PIL import ImageFont
             
-            # Hide all fields except the first one initially
-            if i > 0:
-                container.hide()
-
-    def add_field(self, index):
-        if index < len(self.fields) - 1:
-            self.visible_count += 1
-            self.fields[index + 1][0].show()
-            self.updateGeometry()
-            self.parent().parent().adjustSize()
-
-    def remove_field(self, index):
-        if index == 0:
+            path = self.resolve(name)
+            if path:
+                font = ImageFont.truetype(path, size)
+            else:
+                font = ImageFont.load_default(size)
+            with self.lock:
+                font = self.fonts.setdefault(key, font)
+        return font
+
+    def clear(self):
+        """Forget resolved fonts, e.g. after the fallback list changed"""
+        with self.lock:
+            self.fonts.clear()
+            self.resolved.clear()
+            self.qt_families.clear()
+
+    def qt_family(self, name):
+        """Register the resolved font with Qt and return its family name"""
+        if name not in self.qt_families:
+            family = None
+            path = self.resolve(name)
+            if path:
+                font_id = QFontDatabase.addApplicationFont(path)
+                families = QFontDatabase.applicationFontFamilies(font_id)
+                if families:
+                    family = families[0]
+            self.qt_families[name] = family
+        return self.qt_families[name]
+
+    def warm_up(self, fonts):
+        """Load (name, size) fonts in the background so the first print doesn't wait for them"""
+        def load():
+            for name, size in fonts:
+                self.get(name, size)
+        threading.Thread(target=load, daemon=True).start()
+
+font_registry = FontRegistry()
+
+# One draw operation of a compiled layout: where and how to print one value.
+# source is "fields", "looked_items", "parts_replacement" or "business_info"
+# and key is the field label, list index or preference key.
+DrawOp = namedtuple("DrawOp", "source key x y font size max_width")
+
+class PrintLayout:
+    """A validated print layout compiled into a flat list of draw operations"""
+    def __init__(self, name, page_size, ops, digest):
+        self.name = name
+        self.page_size = page_size
+        self.ops = ops
+        self.digest = digest
+        # Number of rows each list has on one page
+        self.slots = {
+            name: sum(1 for op in ops if op.source == name)
+            for name in ("looked_items", "parts_replacement")
+        }
+        self.scaled_layouts = {}
+
+    def fonts(self):
+        """Every (font, size) pair the layout draws with"""
+        return sorted({(op.font, op.size) for op in self.ops})
+
+    def scaled(self, factor):
+        """The same layout on a page resized by factor, for lower resolution renders"""
+        factor = round(factor, 3)
+        if factor >= 1:
+            return self
+        if factor not in self.scaled_layouts:
+            def scale(value):
+                return None if value is None else max(1, round(value * factor))
+            ops = [
+                op._replace(x=round(op.x * factor), y=round(op.y * factor),
+                            size=scale(op.size), max_width=scale(op.max_width))
+                for op in self.ops
+            ]
+            page_size = (scale(self.page_size[0]), scale(self.page_size[1]))
+            self.scaled_layouts[factor] = PrintLayout(
+                self.name, page_size, ops, f"{self.digest}@{factor}"
+            )
+        return self.scaled_layouts[factor]
+
+def compile_layout(spec, source="layout"):
+    """Validate a layout template and compile it into a PrintLayout
+
+    Positions are pixels on the template's page. An entry is either
+    [x, y] or {"at": [x, y], "font": ..., "size": ..., "max_width": ...}.
+    """
+    def fail(message):
+        raise ValueError(f"{source}: {message}")
+
+    def point(value, where):
+        if (not isinstance(value, (list, tuple)) or len(value) != 2
+                or not all(isinstance(v, (int, float)) and v >= 0 for v in value)):
+            fail(f"{where} must be [x, y] with non-negative numbers")
+        return int(value[0]), int(value[1])
+
+    def positive(value, where):
+        if not isinstance(value, int) or value <= 0:
+            fail(f"{where} must be a positive integer")
+        return value
+
+    if not isinstance(spec, dict):
+        fail("template must be an object")
+    unknown = set(spec) - {
+        "name", "page_size", "font", "font_size", "fields",
+        "looked_items", "parts_replacement", "business_info"
+    }
+    if unknown:
+        fail(f"unknown keys: {', '.join(sorted(unknown))}")
+
+    page_size = point(spec.get("page_size"), "page_size")
+    font = spec.get("font")
+    if not isinstance(font, str) or not font:
+        fail("font must be a font file name")
+    font_size = positive(spec.get("font_size"), "font_size")
+
+    def op(source, key, value, where):
+        options = {}
+        if isinstance(value, dict):
+            options = value
+            unknown = set(options) - {"at", "font", "size", "max_width"}
+            if unknown:
+                fail(f"{where}: unknown keys: {', '.join(sorted(unknown))}")
+            value = options.get("at")
+        x, y = point(value, where)
+        entry_font = options.get("font", font)
+        if not isinstance(entry_font, str) or not entry_font:
+            fail(f"{where}.font must be a font file name")
+        size = positive(options.get("size", font_size), f"{where}.size")
+        max_width = options.get("max_width")
+        if max_width is not None:
+            max_width = positive(max_width, f"{where}.max_width")
+        return DrawOp(source, key, x, y, entry_font, size, max_width)
+
+    ops = []
+    labels = {label.strip(':'): label for label in FORM_PLACEHOLDERS}
+    fields = spec.get("fields", {})
+    if not isinstance(fields, dict):
+        fail("fields must be an object")
+    for name, value in fields.items():
+        if name not in labels:
+            fail(f"unknown field {name!r}")
+        ops.append(op("fields", labels[name], value, f"fields.{name}"))
+
+    for list_name in ("looked_items", "parts_replacement"):
+        entries = spec.get(list_name, [])
+        if not isinstance(entries, list):
+            fail(f"{list_name} must be a list")
+        for i, value in enumerate(entries):
+            ops.append(op(list_name, i, value, f"{list_name}[{i}]"))
+
+    preference_keys = [key for key, _ in PREFERENCE_ITEMS]
+    business_info = spec.get("business_info", {})
+    if not isinstance(business_info, dict):
+        fail("business_info must be an object")
+    for key, value in business_info.items():
+        if key not in preference_keys:
+            fail(f"unknown business_info key {key!r}")
+        ops.append(op("business_info", key, value, f"business_info.{key}"))
+
+    digest = hashlib.sha256(
+        json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return PrintLayout(spec.get("name", source), page_size, ops, digest)
+
+# Compiled layouts by path, reloaded only when the file changes
+layout_cache = {}
+
+def load_layout(path):
+    """Load and compile a JSON or TOML layout template"""
+    mtime = os.path.getmtime(path)
+    cached = layout_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    if path.lower().endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            spec = tomllib.load(f)
+    else:
+        with open(path, encoding='utf-8') as f:
+            spec = json.load(f)
+
+    layout = compile_layout(spec, os.path.basename(path))
+    layout_cache[path] = (mtime, layout)
+    return layout
+
+def available_layouts():
+    """Names of the layout templates shipped in the layouts directory"""
+    directory = resource_path("layouts")
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.splitext(name)[0] for name in os.listdir(directory)
+        if name.lower().endswith((".json", ".toml"))
+    )
+
+def layout_path(name):
+    """Resolve a layout setting, either a file path or a shipped template name"""
+    if os.path.isfile(name):
+        return name
+    for extension in (".json", ".toml"):
+        path = resource_path(os.path.join("layouts", name + extension))
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"Layout template not found: {name}")
+
+def current_layout():
+    """Load the layout chosen in preferences"""
+    return load_layout(layout_path(preferences.get("layout_template", "default")))
+
+def fit_text(text, max_width, measure):
+    """Cut text down until measure(text) fits in max_width"""
+    if max_width is None or measure(text) <= max_width:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if measure(text[:middle]) <= max_width:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+def form_pages(form_data, layout):
+    """Split form data into one form data per printed page
+
+    Every page repeats the fields, the looked items and parts replacement
+    lists continue from where the previous page ran out of rows.
+    """
+    page_count = 1
+    for name, slots in layout.slots.items():
+        if slots:
+            page_count = max(page_count, -(-len(form_data[name]) // slots))
+    for page in range(page_count):
+        page_data = {"fields": form_data["fields"]}
+        for name, slots in layout.slots.items():
+            page_data[name] = form_data[name][page * slots:(page + 1) * slots]
+        yield page_data
+
+def form_text_items(form_data, business_info, layout):
+    """Yield (draw op, text) for everything printed on the page"""
+    for op in layout.ops:
+        if op.source == "fields":
+            text = form_data["fields"].get(op.key)
+        elif op.source == "business_info":
+            text = business_info.get(op.key, "")
+        else:
+            values = form_data[op.source]
+            text = values[op.key] if op.key < len(values) else None
+        if text:
+            yield op, text
+
+# Raster page encodings: PIL image mode and bytes per pixel
+RASTER_ENCODINGS = {
+    "rgb": ("RGB", 3),
+    "grayscale": ("L", 1),
+    "bilevel": ("1", 1 / 8)
+}
+
+def render_form_page(form_data, business_info, layout, progress=None, encoding="rgb"):
+    """Rasterize one form page and return it as a QImage
+
+    progress, if given, is called with the percentage done. encoding is
+    one of RASTER_ENCODINGS; the forms are black on white, so grayscale
+    and bilevel pages print the same at a fraction of the size.
+    """
+    from PIL import Image, ImageDraw
+
+    mode, _ = RASTER_ENCODINGS[encoding]
+    image = Image.new(mode, layout.page_size, 'white')
+    draw = ImageDraw.Draw(image)
+
+    items = list(form_text_items(form_data, business_info, layout))
+    with metrics.phase("render.fonts"):
+        fonts = {(op.font, op.size): font_registry.get(op.font, op.size) for op, _ in items}
+
+    reported = 0
+    with metrics.phase("render.draw"):
+        for i, (op, text) in enumerate(items):
+            font = fonts[op.font, op.size]
+            text = fit_text(text, op.max_width, font.getlength)
+            draw.text((op.x, op.y), text, fill="black", font=font)
+            # Leave the last step for the hand-off to Qt
+            percent = (i + 1) * 90 // len(items)
+            if progress and percent != reported:
+                reported = percent
+                progress(percent)
+
+    with metrics.phase("render.encode"):
+        page_image = pil_to_qimage(image)
+    if progress:
+        progress(100)
+    return page_image
+
+class SaveSignals(QObject):
+    """Signals of a SaveTask, delivered on the GUI thread"""
+    finished = Signal(object)
+    failed = Signal(object, str)
+
+class SaveTask(QRunnable):
+    """Writes one form CSV on a worker thread"""
+    def __init__(self, file_name, form_data, business_info):
+        super().__init__()
+        self.file_name = file_name
+        self.form_data = form_data
+        self.business_info = business_info
+        self.signals = SaveSignals()
+
+    def run(self):
+        try:
+            with metrics.phase("save.write"):
+                write_form_csv(self.file_name, form_items(self.form_data, self.business_info))
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+            return
+        self.signals.finished.emit(self)
+
+def page_cache_key(form_data, business_info, layout, encoding="rgb"):
+    """Render cache key for a raster page"""
+    # The font files actually used, so pages drawn with other fallbacks aren't reused
+    fonts = [font_registry.resolve(name) for name in sorted({name for name, _ in layout.fonts()})]
+    return RenderCache.make_key(form_data, business_info, layout.digest, encoding, fonts)
+
+class RenderSignals(QObject):
+    """Signals of a RenderTask, delivered on the GUI thread"""
+    progress = Signal(int)
+    page_rendered = Signal(str, QImage)
+    finished = Signal()
+    failed = Signal(str)
+
+class RenderTask(QRunnable):
+    """Rasterizes form pages on a worker thread, handing each one over as it is done
+
+    With ahead set, the worker waits once that many pages are waiting to
+    be picked up; the receiver calls release() for each page it's done with.
+    """
+    def __init__(self, pages, business_info, layout, encoding="rgb", ahead=None):
+        super().__init__()
+        self.pages = pages  # [(cache key, page form data)]
+        self.business_info = business_info
+        self.layout = layout
+        self.encoding = encoding
+        self.signals = RenderSignals()
+        self.slots = threading.Semaphore(ahead) if ahead else None
+        self.cancelled = False
+
+    def release(self):
+        """Let the worker render one more page"""
+        if self.slots is not None:
+            self.slots.release()
+
+    def cancel(self):
+        """Stop before the next page"""
+        self.cancelled = True
+        self.release()
+
+    def run(self):
+        count = len(self.pages)
+        try:
+            for number, (cache_key, page_data) in enumerate(self.pages):
+                if self.slots is not None:
+                    self.slots.acquire()
+                if self.cancelled:
+                    return
+                page_image = render_form_page(
+                    page_data, self.business_info, self.layout,
+                    lambda percent: self.signals.progress.emit((number * 100 + percent) // count),
+                    self.encoding
+                )
+                self.signals.page_rendered.emit(cache_key, page_image)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit()
+
+def draw_form_vector(painter, page_size, form_data, business_info, layout):
+    """Draw the form text directly with QPainter at device resolution"""
+    scale = min(page_size.width() / layout.page_size[0], page_size.height() / layout.page_size[1])
+    painter.setPen(Qt.black)
+
+    fonts = {}
+    for op, text in form_text_items(form_data, business_info, layout):
+        if (op.font, op.size) not in fonts:
+            font = QFont(font_registry.qt_family(op.font) or "MS Gothic")
+            font.setPixelSize(max(1, round(op.size * scale)))
+            fonts[op.font, op.size] = font
+        painter.setFont(fonts[op.font, op.size])
+        font_metrics = painter.fontMetrics()
+        if op.max_width is not None:
+            text = fit_text(text, op.max_width * scale, font_metrics.horizontalAdvance)
+        # PIL positions text by its top edge, QPainter by its baseline
+        painter.drawText(QPointF(op.x * scale, op.y * scale + font_metrics.ascent()), text)
+
+class RenderCache:
+    """LRU cache of rendered pages keyed by a hash of everything drawn on them"""
+    def __init__(self, max_bytes, disk_dir=None, max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_bytes = None  # Measured when the disk tier is first written
+        self.total_bytes = 0
+        self.pages = OrderedDict()
+        # One writer, so encoding pages never piles up threads
+        self.disk_pool = QThreadPool()
+        self.disk_pool.setMaxThreadCount(1)
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash the render inputs into a cache key"""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.png") if self.disk_dir else None
+
+    def contains(self, key):
+        """Whether get(key) would find a page, without loading it"""
+        return key in self.pages or bool(self.disk_dir and os.path.exists(self.disk_path(key)))
+
+    def get(self, key, keep=True):
+        """Return the cached page for key, or None
+
+        keep=False leaves a page read from the disk tier out of memory.
+        """
+        image = self.pages.get(key)
+        if image is not None:
+            self.pages.move_to_end(key)
+            return image
+
+        # Fall back to the on-disk tier
+        if self.disk_dir:
+            path = self.disk_path(key)
+            if os.path.exists(path):
+                image = QImage(path)
+                if not image.isNull():
+                    try:
+                        os.utime(path)  # Evicted least recently used first
+                    except OSError:
+                        pass
+                    if keep:
+                        self.put(key, image, write_disk=False)
+                    return image
+        return None
+
+    def put(self, key, image, write_disk=True):
+        """Store a rendered page, evicting the least recently used ones"""
+        if key in self.pages:
+            self.total_bytes -= self.pages.pop(key).sizeInBytes()
+        self.pages[key] = image
+        self.total_bytes += image.sizeInBytes()
+        while self.total_bytes > self.max_bytes and len(self.pages) > 1:
+            _, evicted = self.pages.popitem(last=False)
+            self.total_bytes -= evicted.sizeInBytes()
+
+        if write_disk and self.disk_dir:
+            # Encoding a full page takes a while, keep it off the paint path
+            self.disk_pool.start(lambda: self._write_disk(key, image))
+
+    def _write_disk(self, key, image):
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self.disk_path(key)
+            if os.path.exists(path):
+                return
+            temp_path = f"{path}.tmp"
+            if not image.save(temp_path, "PNG"):
+                return
+            os.replace(temp_path, path)
+            if self.disk_bytes is not None:
+                self.disk_bytes += os.path.getsize(path)
+            if self.disk_bytes is None or self.disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+        except OSError:
+            pass  # The disk tier is only an optimization
+
+    def _evict_disk(self):
+        """Delete the least recently used pages until the disk tier fits max_disk_bytes"""
+        pages = []
+        with os.scandir(self.disk_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    pages.append((stat.st_mtime, stat.st_size, entry.path))
+        self.disk_bytes = sum(size for _, size, _ in pages)
+        for _, size, path in sorted(pages):
+            if self.disk_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                self.disk_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        self.pages.clear()
+        self.total_bytes = 0
+
+    def capacity(self, page_size, encoding="rgb"):
+        """How many pages of page_size fit in memory at once"""
+        _, bytes_per_pixel = RASTER_ENCODINGS[encoding]
+        return max(1, int(self.max_bytes // (page_size[0] * page_size[1] * bytes_per_pixel)))
+
+def raster_page(page_data, business_info, layout, render_cache=None, encoding="rgb"):
+    """Return the rendered page, from the cache if nothing drawn on it has changed"""
+    cache_key = page_cache_key(page_data, business_info, layout, encoding)
+    with metrics.phase("paint.cache_lookup"):
+        page_image = render_cache.get(cache_key) if render_cache is not None else None
+    if page_image is None:
+        page_image = render_form_page(page_data, business_info, layout, encoding=encoding)
+        if render_cache is not None:
+            render_cache.put(cache_key, page_image)
+    return page_image
+
+def paint_form(printer, form_data, business_info, layout, backend="raster", render_cache=None,
+               encoding="rgb", page_images=None):
+    """Paint a form onto a printer with the chosen backend
+
+    Items that don't fit the layout continue on extra pages. Pages are
+    rendered and sent to the printer one at a time. encoding sets the
+    raster page format, see RASTER_ENCODINGS. page_images, if given,
+    yields the raster pages already rendered, in page order.
+    """
+    from PySide6.QtPrintSupport import QPrinter
+
+    page_rect = printer.pageRect(QPrinter.DevicePixel)
+    page_size = QSize(int(page_rect.width()), int(page_rect.height()))
+
+    # Draw to printer
+    painter = QPainter()
+    if not painter.begin(printer):
+        raise RuntimeError("Could not start painting on the printer")
+    try:
+        for number, page_data in enumerate(form_pages(form_data, layout)):
+            if number and not printer.newPage():
+                raise RuntimeError("Could not start a new page on the printer")
+            if backend == "vector":
+                with metrics.phase("paint.vector"):
+                    draw_form_vector(painter, page_size, page_data, business_info, layout)
+                continue
+            if page_images is not None:
+                page_image = next(page_images)
+            else:
+                page_image = raster_page(page_data, business_info, layout, render_cache, encoding)
+            # Let the printer scale the page to device resolution
+            with metrics.phase("paint.scale"):
+                target_size = page_image.size().scaled(page_size, Qt.KeepAspectRatio)
+                painter.setRenderHint(QPainter.SmoothPixmapTransform)
+                painter.drawImage(QRect(QPoint(0, 0), target_size), page_image)
+            page_image = None  # Keep at most one uncached page alive
+    finally:
+        # The printer writes the pages out here
+        with metrics.phase("paint.output"):
+            painter.end()
+
+def is_preview(printer):
+    """Whether printer is painting a print preview rather than real output"""
+    from PySide6.QtGui import QPaintEngine
+
+    engine = printer.paintEngine()
+    return engine is not None and engine.type() == QPaintEngine.Picture
+
+def preview_layout(printer, layout):
+    """layout scaled down to the screen resolution for previews on printer"""
+    from PySide6.QtPrintSupport import QPrinter
+
+    screen = QApplication.primaryScreen()
+    if screen is None:
+        return layout
+    screen_dpi = screen.logicalDotsPerInch() * screen.devicePixelRatio()
+    page_dpi = layout.page_size[0] / printer.pageRect(QPrinter.Inch).width()
+    return layout.scaled(screen_dpi / page_dpi)
+
+def create_printer():
+    """Create a printer with fixed A4 Landscape settings"""
+    from PySide6.QtPrintSupport import QPrinter
+
+    printer = QPrinter(QPrinter.HighResolution)
+    printer.setPageOrientation(QPageLayout.Landscape)
+    printer.setPageSize(QPageSize(QPageSize.A4))
+    return printer
+
+def form_date(fields, prefix):
+    """Combine the year/month/day fields into YYYYMMDD, or '' if incomplete"""
+    parts = [fields.get(f"{prefix} {unit}:", "").strip() for unit in ("year", "month", "day")]
+    if not all(part.isdigit() for part in parts):
+        return ""
+    year, month, day = parts
+    return f"{year:0>4}{month:0>2}{day:0>2}"
+
+class JobHistory:
+    """SQLite store of every saved form"""
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+
+    def connect(self):
+        """Open the database on first use and create the schema"""
+        if self.connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    saved_at TEXT NOT NULL,
+                    registration_number TEXT NOT NULL,
+                    model_number TEXT NOT NULL,
+                    checked_date TEXT NOT NULL,
+                    maintained_date TEXT NOT NULL,
+                    fields TEXT NOT NULL,
+                    looked_items TEXT NOT NULL,
+                    parts_replacement TEXT NOT NULL,
+                    preferences TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_registration ON jobs (registration_number, id);
+                CREATE INDEX IF NOT EXISTS jobs_model ON jobs (model_number, id);
+                CREATE INDEX IF NOT EXISTS jobs_checked ON jobs (checked_date);
+                CREATE INDEX IF NOT EXISTS jobs_maintained ON jobs (maintained_date);
+            """)
+        return self.connection
+
+    INSERT = (
+        "INSERT INTO jobs (saved_at, registration_number, model_number, checked_date,"
+        " maintained_date, fields, looked_items, parts_replacement, preferences)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    @staticmethod
+    def job_row(form_data, business_info, saved_at=None):
+        """Build the column values for one job"""
+        from datetime import datetime
+
+        fields = form_data["fields"]
+        return (
+            saved_at or datetime.now().isoformat(timespec="seconds"),
+            fields.get("Registration number:", ""),
+            fields.get("Model number:", ""),
+            form_date(fields, "Checked"),
+            form_date(fields, "Maintained"),
+            json.dumps(fields, ensure_ascii=False),
+            json.dumps(form_data["looked_items"], ensure_ascii=False),
+            json.dumps(form_data["parts_replacement"], ensure_ascii=False),
+            json.dumps(business_info, ensure_ascii=False)
+        )
+
+    def add(self, form_data, business_info, saved_at=None):
+        """Record a saved form and return its job id"""
+        with self.connect() as connection:
+            cursor = connection.execute(self.INSERT, self.job_row(form_data, business_info, saved_at))
+        return cursor.lastrowid
+
+    def add_many(self, jobs):
+        """Record (form_data, business_info, saved_at) jobs in one transaction"""
+        with self.connect() as connection:
+            cursor = connection.executemany(
+                self.INSERT, (self.job_row(*job) for job in jobs)
+            )
+        return cursor.rowcount
+
+    def iter_jobs(self):
+        """Yield (form_data, business_info, saved_at) for every job, oldest first"""
+        cursor = self.connect().execute(
+            "SELECT fields, looked_items, parts_replacement, preferences, saved_at"
+            " FROM jobs ORDER BY id"
+        )
+        for fields, looked_items, parts_replacement, preferences, saved_at in cursor:
+            form_data = {
+                "fields": json.loads(fields),
+                "looked_items": json.loads(looked_items),
+                "parts_replacement": json.loads(parts_replacement)
+            }
+            yield form_data, json.loads(preferences), saved_at
+
+    def get(self, job_id):
+        """Return (form_data, business_info) for a job, or None"""
+        row = self.connect().execute(
+            "SELECT fields, looked_items, parts_replacement, preferences FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        form_data = {
+            "fields": json.loads(row[0]),
+            "looked_items": json.loads(row[1]),
+            "parts_replacement": json.loads(row[2])
+        }
+        return form_data, json.loads(row[3])
+
+    def open_reader(self):
+        """Open a separate connection for reading on another thread"""
+        return sqlite3.connect(self.path)
+
+    def latest_jobs(self, column, connection=None):
+        """Return (number, newest job id) for every registration_number or model_number"""
+        if column not in ("registration_number", "model_number"):
+            raise ValueError(f"Not a vehicle column: {column}")
+        connection = connection or self.connect()
+        # Answered from the (number, id) index alone, without reading the rows
+        return connection.execute(
+            f"SELECT {column}, MAX(id) FROM jobs WHERE {column} != '' GROUP BY {column}"
+        ).fetchall()
+
+    def latest_dates(self, connection=None):
+        """Return (registration_number, newest checked_date, newest maintained_date,
+        newest job id) for every vehicle"""
+        connection = connection or self.connect()
+        return connection.execute(
+            "SELECT registration_number, MAX(checked_date), MAX(maintained_date), MAX(id)"
+            " FROM jobs WHERE registration_number != '' GROUP BY registration_number"
+        ).fetchall()
+
+    def search(self, text="", limit=200):
+        """Return the newest jobs whose registration or model number starts with text
+
+        Rows are (id, saved_at, registration_number, model_number,
+        checked_date, maintained_date).
+        """
+        columns = "id, saved_at, registration_number, model_number, checked_date, maintained_date"
+        connection = self.connect()
+        if not text:
+            return connection.execute(
+                f"SELECT {columns} FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+        # Range comparisons let SQLite walk the indexes for the prefix. Only the
+        # ids are merged, so the JSON columns aren't copied into a temp table
+        upper = text + "\U0010ffff"
+        return connection.execute(
+            f"SELECT {columns} FROM jobs WHERE id IN ("
+            f" SELECT id FROM jobs WHERE registration_number >= ? AND registration_number < ?"
+            f" UNION"
+            f" SELECT id FROM jobs WHERE model_number >= ? AND model_number < ?"
+            f") ORDER BY id DESC LIMIT ?",
+            (text, upper, text, upper, limit)
+        ).fetchall()
+
+# Japanese plate: region, class number, kana and serial, e.g. "富士山 300 り 8888"
+RegistrationNumber = namedtuple("RegistrationNumber", "region class_number kana serial")
+
+REGISTRATION_PATTERN = re.compile(
+    r"^\s*(?P<region>[^\s\d]+?)\s*"
+    r"(?P<class_number>\d[0-9A-Z]{0,2})\s*"
+    r"(?P<kana>[ぁ-んァ-ヶ])\s*"
+    r"(?P<serial>\d{1,2}-\d{2}|[・.\d]{1,4})\s*$"
+)
+
+def parse_registration(text):
+    """Split a registration number into its parts, or return None"""
+    match = REGISTRATION_PATTERN.match(normalizer.normalize(text).upper())
+    if match is None:
+        return None
+    return RegistrationNumber(**match.groupdict())
+
+def format_registration(registration):
+    """Spell parsed registration parts the way the form prints them"""
+    return " ".join(registration)
+
+class PrefixIndex:
+    """Sorted keys searched by prefix with bisect"""
+    def __init__(self):
+        self.keys = []
+        self.entries = {}  # key -> (display text, job id)
+
+    def add(self, key, display, job_id):
+        if key not in self.entries:
+            self.keys.insert(bisect_left(self.keys, key), key)
+            self.entries[key] = (display, job_id)
+        elif self.entries[key][1] < job_id:
+            self.entries[key] = (display, job_id)
+
+    def merge(self, entries):
+        """Add many entries at once, keeping the newest job per key"""
+        for key, (display, job_id) in entries.items():
+            if key not in self.entries or self.entries[key][1] < job_id:
+                self.entries[key] = (display, job_id)
+        self.keys = sorted(self.entries)
+
+    def search(self, prefix, limit):
+        """Return up to limit (display text, job id) whose key starts with prefix"""
+        results = []
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and len(results) < limit and self.keys[i].startswith(prefix):
+            results.append(self.entries[self.keys[i]])
+            i += 1
+        return results
+
+    def get(self, key):
+        return self.entries.get(key)
+
+class VehicleIndex:
+    """In-memory prefix index of registration and model numbers over the job history"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.indexes = {"registration": PrefixIndex(), "model": PrefixIndex()}
+
+    @staticmethod
+    def entry(kind, text):
+        """Return (search key, display text) for a registration or model number"""
+        if kind == "registration":
+            registration = parse_registration(text)
+            display = format_registration(registration) if registration else normalizer.normalize(text).strip()
+        else:
+            display = normalizer.normalize(text).strip().upper()
+        return display.replace(" ", "").upper(), display
+
+    def add_job(self, job_id, fields):
+        """Index one saved job"""
+        with self.lock:
+            for kind, label in (("registration", "Registration number:"), ("model", "Model number:")):
+                text = fields.get(label, "")
+                if text.strip():
+                    key, display = self.entry(kind, text)
+                    self.indexes[kind].add(key, display, job_id)
+
+    def load(self, history):
+        """Index every vehicle's newest job on a background thread"""
+        def load():
+            built = {"registration": {}, "model": {}}
+            try:
+                connection = history.open_reader()
+                try:
+                    for kind in built:
+                        for text, job_id in history.latest_jobs(f"{kind}_number", connection):
+                            key, display = self.entry(kind, text)
+                            # Spellings that parse to the same number share a key
+                            if key not in built[kind] or built[kind][key][1] < job_id:
+                                built[kind][key] = (display, job_id)
+                finally:
+                    connection.close()
+            except sqlite3.Error:
+                return  # No history yet
+            with self.lock:
+                for kind, entries in built.items():
+                    self.indexes[kind].merge(entries)
+        threading.Thread(target=load, daemon=True).start()
+
+    def complete(self, kind, text, limit=20):
+        """Return display texts of indexed numbers starting with text"""
+        key, _ = self.entry(kind, text)
+        if not key:
+            return []
+        with self.lock:
+            return [display for display, _ in self.indexes[kind].search(key, limit)]
+
+    def last_job(self, kind, text):
+        """Return the id of the newest job for a registration or model number, or None"""
+        key, _ = self.entry(kind, text)
+        with self.lock:
+            entry = self.indexes[kind].get(key)
+        return entry[1] if entry else None
+
+# Months from the last checked or maintained date until the next one is due
+DUE_INTERVALS = OrderedDict([
+    ("Inspection", ("Checked", 24)),
+    ("Maintenance", ("Maintained", 12)),
+])
+
+def due_date(last_date, months):
+    """Return the YYYYMMDD date months after last_date, or '' if it's not a date"""
+    date = QDate.fromString(last_date, "yyyyMMdd")
+    if not date.isValid():
+        return ""
+    # addMonths clamps the day to the end of shorter months
+    return date.addMonths(months).toString("yyyyMMdd")
+
+class DueDateIndex:
+    """Each vehicle's next inspection and maintenance due date, kept sorted by date"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.due = []  # Sorted (due date, vehicle key, kind)
+        self.vehicles = {}  # (vehicle key, kind) -> (due date, last date, display, job id)
+
+    def update(self, key, display, kind, last_date, job_id):
+        """Move a vehicle to its new due date if last_date is newer; call with the lock held"""
+        due = due_date(last_date, DUE_INTERVALS[kind][1])
+        if not due:
+            return
+        current = self.vehicles.get((key, kind))
+        if current is not None:
+            if (current[1], current[3]) >= (last_date, job_id):
+                return
+            del self.due[bisect_left(self.due, (current[0], key, kind))]
+        self.vehicles[key, kind] = (due, last_date, display, job_id)
+        self.due.insert(bisect_left(self.due, (due, key, kind)), (due, key, kind))
+
+    def add_job(self, job_id, fields):
+        """Index the dates of one saved job"""
+        text = fields.get("Registration number:", "")
+        if not text.strip():
+            return
+        key, display = VehicleIndex.entry("registration", text)
+        with self.lock:
+            for kind, (prefix, _) in DUE_INTERVALS.items():
+                self.update(key, display, kind, form_date(fields, prefix), job_id)
+
+    def load(self, history):
+        """Index every vehicle's newest dates on a background thread"""
+        def load():
+            try:
+                connection = history.open_reader()
+                try:
+                    rows = history.latest_dates(connection)
+                finally:
+                    connection.close()
+            except sqlite3.Error:
+                return  # No history yet
+            vehicles = {}
+            dues = {}  # Most vehicles share a few thousand distinct dates
+            for text, checked_date, maintained_date, job_id in rows:
+                key, display = VehicleIndex.entry("registration", text)
+                for kind, last_date in (("Inspection", checked_date), ("Maintenance", maintained_date)):
+                    if (kind, last_date) not in dues:
+                        dues[kind, last_date] = due_date(last_date, DUE_INTERVALS[kind][1])
+                    due = dues[kind, last_date]
+                    current = vehicles.get((key, kind))
+                    if due and (current is None or (current[1], current[3]) < (last_date, job_id)):
+                        vehicles[key, kind] = (due, last_date, display, job_id)
+            with self.lock:
+                # Jobs saved while loading are newer than anything read here
+                for (key, kind), (due, last_date, display, job_id) in vehicles.items():
+                    current = self.vehicles.get((key, kind))
+                    if current is None or (current[1], current[3]) < (last_date, job_id):
+                        self.vehicles[key, kind] = (due, last_date, display, job_id)
+                self.due = sorted((due, key, kind) for (key, kind), (due, *_) in self.vehicles.items())
+        threading.Thread(target=load, daemon=True).start()
+
+    def between(self, start, end):
+        """Return (due date, kind, display, last date, job id) due from start through end"""
+        results = []
+        with self.lock:
+            i = bisect_left(self.due, (start,))
+            while i < len(self.due) and self.due[i][0] <= end:
+                due, key, kind = self.due[i]
+                _, last_date, display, job_id = self.vehicles[key, kind]
+                results.append((due, kind, display, last_date, job_id))
+                i += 1
+        return results
+
+class RecoveryJournal:
+    """Append-only journal of unsaved form edits, replayed after a crash
+
+    Each line is a JSON object holding only the entries that changed since
+    the previous line. Entries are keyed "fields/<label>", "<group>/<row>"
+    and "<group>/count" for the looked items and parts replacement rows.
+    """
+
+    GROUPS = ("looked_items", "parts_replacement")
+    COMPACT_AFTER = 200  # Lines before the journal is rewritten as one snapshot
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        self.lines = 0
+        self.file = None
+
+    @classmethod
+    def flatten(cls, form_data):
+        """Turn form data into a flat dict of journal entries"""
+        flat = {f"fields/{label}": text for label, text in form_data["fields"].items()}
+        for group in cls.GROUPS:
+            values = form_data[group]
+            flat[f"{group}/count"] = len(values)
+            for i, text in enumerate(values):
+                flat[f"{group}/{i}"] = text
+        return flat
+
+    @classmethod
+    def unflatten(cls, flat):
+        """Turn journal entries back into form data"""
+        form_data = {"fields": {label: flat.get(f"fields/{label}", "") for label in FORM_PLACEHOLDERS}}
+        for group in cls.GROUPS:
+            count = int(flat.get(f"{group}/count", 0))
+            form_data[group] = [flat.get(f"{group}/{i}", "") for i in range(count)]
+        return form_data
+
+    def record(self, form_data):
+        """Append the entries that changed since the last record"""
+        flat = self.flatten(form_data)
+        # self.state is what a replay would load, including rows removed since,
+        # so a row that comes back empty is written instead of replaying old text
+        delta = {
+            key: value for key, value in flat.items()
+            if self.state.get(key, 0 if key.endswith("/count") else "") != value
+        }
+        if not delta:
+            return
+
+        if self.file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.file = open(self.path, 'a', encoding='utf-8')
+        self.file.write(json.dumps(delta, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.state.update(delta)
+        self.lines += 1
+
+        if self.lines >= self.COMPACT_AFTER:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal as a single snapshot line"""
+        self.close()
+        # Entries of removed rows aren't needed once nothing precedes the snapshot
+        self.state = self.flatten(self.unflatten(self.state))
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=directory, prefix='.carform-', delete=False
+        ) as temp_file:
+            temp_file.write(json.dumps(self.state, ensure_ascii=False) + "\n")
+        os.replace(temp_file.name, self.path)
+        self.lines = 1
+
+    def replay(self):
+        """Load the journal, returning the unsaved form data or None"""
+        flat = {}
+        lines = 0
+        torn = False
+        try:
+            with open(self.path, encoding='utf-8') as journal:
+                for line in journal:
+                    try:
+                        flat.update(json.loads(line))
+                    except ValueError:
+                        torn = True  # The last line was cut short by the crash
+                        break
+                    lines += 1
+        except FileNotFoundError:
+            return None
+
+        self.state = flat
+        self.lines = lines
+        if torn:
+            # Don't append after a partial line
+            self.compact()
+        if not any(value for key, value in flat.items() if not key.endswith("/count")):
+            return None
+        return self.unflatten(flat)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def clear(self):
+        """Forget the journal once the form is saved or discarded"""
+        self.close()
+        self.state = {}
+        self.lines = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+class ItemListModel(QAbstractListModel):
+    """The rows of a FieldGroup, labelled like the original numbered fields"""
+    def __init__(self, base_label, parent=None):
+        super().__init__(parent)
+        self.base_label = base_label
+        self.items = [""]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self.items[index.row()]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        if self.items[index.row()] != value:
+            self.items[index.row()] = value
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Vertical and role == Qt.DisplayRole:
+            return f"{self.base_label}{section + 1 if section > 0 else ''}:"
+        return None
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        self.beginInsertRows(parent, row, row + count - 1)
+        self.items[row:row] = [""] * count
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.items[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def set_items(self, items):
+        self.beginResetModel()
+        self.items = list(items) or [""]
+        self.endResetModel()
+
+class ItemDelegate(QStyledItemDelegate):
+    """Edits a row with a line edit that commits on every keystroke"""
+    def __init__(self, setup_editor=None, parent=None):
+        super().__init__(parent)
+        self.setup_editor = setup_editor
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setFrame(False)
+        if self.setup_editor:
+            self.setup_editor(editor)
+        # Keep the model current so values() never misses text being typed
+        row = QPersistentModelIndex(index)
+        editor.textChanged.connect(
+            lambda text: row.isValid() and row.data(Qt.EditRole) != text and self.commitData.emit(editor)
+        )
+        return editor
+
+    def setEditorData(self, editor, index):
+        # Leave the cursor alone when the model echoes back the text just typed
+        text = index.data(Qt.EditRole) or ""
+        if editor.text() != text:
+            editor.setText(text)
+
+class FieldGroup(QFrame):
+    """A growable list of text rows backed by ItemListModel
+
+    Only the visible rows are painted and only the row being edited has a
+    widget, so the cost doesn't grow with the number of rows.
+    """
+    changed = Signal()  # Emitted when rows are edited, added or removed
+
+    ROW_HEIGHT = 25
+    MAX_VISIBLE_ROWS = 9  # Longer lists scroll instead of growing the window
+
+    def __init__(self, base_label: str, setup_editor=None):
+        super().__init__()
+        self.setFrameStyle(QFrame.StyledPanel)
+        self.layout = QVBoxLayout(self)
+        self.layout.setSpacing(2)
+        self.layout.setContentsMargins(5, 5, 5, 5)
+        
+        self.model = ItemListModel(base_label, self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(ItemDelegate(setup_editor, self.view))
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setStretchLastSection(True)
+        # Uniform row heights let the view lay out any number of rows at once
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+        self.view.verticalHeader().setMinimumWidth(100)
+        self.view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.view.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.view.setMinimumWidth(400)
+        self.layout.addWidget(self.view)
+        
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        add_btn = QPushButton("Add")
+        self.remove_btn = QPushButton("Remove")
+        for button in (add_btn, self.remove_btn):
+            button.setFixedSize(60, 25)
+            buttons.addWidget(button)
+        self.layout.addLayout(buttons)
+        
+        add_btn.clicked.connect(self.add_field)
+        self.remove_btn.clicked.connect(self.remove_field)
+        self.model.dataChanged.connect(self.changed)
+        self.model.rowsInserted.connect(self.on_rows_changed)
+        self.model.rowsRemoved.connect(self.on_rows_changed)
+        self.model.modelReset.connect(self.on_rows_changed)
+        self.on_rows_changed()
+
+    @property
+    def visible_count(self):
+        return self.model.rowCount()
+
+    def on_rows_changed(self):
+        # Grow with the list up to MAX_VISIBLE_ROWS, then scroll
+        rows = min(self.model.rowCount(), self.MAX_VISIBLE_ROWS)
+        self.view.setFixedHeight(rows * self.ROW_HEIGHT + 2 * self.view.frameWidth())
+        self.remove_btn.setEnabled(self.model.rowCount() > 1)
+        self.changed.emit()
+
+    def add_field(self):
+        """Insert an empty row below the current one and start editing it"""
+        current = self.view.currentIndex()
+        row = current.row() + 1 if current.isValid() else self.model.rowCount()
+        self.model.insertRows(row, 1)
+        index = self.model.index(row)
+        self.view.setCurrentIndex(index)  # Opens the editor through AllEditTriggers
+
+    def remove_field(self):
+        """Remove the current row, always keeping at least one"""
+        current = self.view.currentIndex()
+        if self.model.rowCount() <= 1:
             return
-            
-        if index < len(self.fields):
-            self.visible_count -= 1
-            self.fields[index][0].hide()
-            self.updateGeometry()
-            self.parent().parent().adjustSize()
+        row = current.row() if current.isValid() else self.model.rowCount() - 1
+        self.model.removeRows(row, 1)
 
-    def sizeHint(self):
-        height = sum(field[0].sizeHint().height() for field in self.fields if field[0].isVisible())
-        return self.layout.sizeHint()
+    def values(self):
+        """Return the text of every row"""
+        return list(self.model.items)
+
+    def set_values(self, values):
+        """Replace the rows with values"""
+        # Close any open editor first so the reset doesn't orphan it
+        self.view.setCurrentIndex(QModelIndex())
+        self.model.set_items(values)
 
 class CarForm(QMainWindow):
     def __init__(self):
         super().__init__()
         # Fix icon loading
-        icon = QPixmap(resource_path("CarForm_amaterasuqbb_icon.ico"))
+        icon = assets.pixmap("CarForm_amaterasuqbb_icon.ico")
         self.setWindowIcon(icon)
         
         # Rest of your initialization code...
         QApplication.setOrganizationName(organization_name)
         QApplication.setApplicationName(app_name)
         
+        # Settings are read once here and then served from memory
+        preferences.watch()
+        preferences.changed.connect(self.on_preferences_changed)
+        
         # Only enable close button, disable minimize
         self.setWindowFlags(
             Qt.Window |
@@ -180,20 +1860,8 @@ class CarForm(QMainWindow):
         form_layout.setSpacing(5)
         form_layout.setContentsMargins(5, 5, 5, 5)
         
-        placeholders = {
-            "Registration number:": "富士山 300 り 8888",
-            "Model number:": "AA100A-1001001",
-            "Travel distance:": "0",
-            "Checked year:": "20250101",
-            "Checked month:": "01",
-            "Checked day:": "01",
-            "Maintained year:": "20250202",
-            "Maintained month:": "02",
-            "Maintained day:": "02"
-        }
-        
         self.form_fields = {}
-        for i, (label_text, placeholder) in enumerate(placeholders.items()):
+        for i, (label_text, placeholder) in enumerate(FORM_PLACEHOLDERS.items()):
             label = QLabel(label_text)
             label.setMinimumWidth(100)  # Set fixed width for labels
             
@@ -253,18 +1921,12 @@ class CarForm(QMainWindow):
         form_box.setLayout(form_layout)
         layout.addWidget(form_box)
         
-        self.looked_items = FieldGroup("Looked items", 9)
-        self.parts_replacement = FieldGroup("Parts replacement", 5)
+        # Row editors get the same character conversion as the form fields
+        self.looked_items = FieldGroup("Looked items", self.setup_form_field)
+        self.parts_replacement = FieldGroup("Parts replacement", self.setup_form_field)
         layout.addWidget(self.looked_items)
         layout.addWidget(self.parts_replacement)
         
-        # Apply conversion to FieldGroup fields
-        for container, field, _ in self.looked_items.fields:
-            self.setup_form_field(field)
-        
-        for container, field, _ in self.parts_replacement.fields:
-            self.setup_form_field(field)
-        
         print_btn = QPushButton("Print")
         print_btn.setFixedHeight(25)
         layout.addWidget(print_btn)
@@ -272,6 +1934,67 @@ class CarForm(QMainWindow):
         print_btn.clicked.connect(self.print_to_pdf)
         
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        
+        # Rendered pages are reused across preview repaints
+        self.render_cache = RenderCache(
+            int(preferences.get("render_cache_mb", 256)) * 1024 * 1024,
+            preferences.get("render_cache_dir", "") or None,
+            int(preferences.get("render_cache_disk_mb", 1024)) * 1024 * 1024
+        )
+        
+        # Pages are rasterized on worker threads while the window stays responsive
+        self.render_pool = QThreadPool.globalInstance()
+        self.render_task = None
+        self.render_progress = QProgressBar()
+        self.render_progress.setRange(0, 100)
+        self.render_progress.setFixedWidth(150)
+        self.render_progress.hide()
+        self.statusBar().addPermanentWidget(self.render_progress)
+        
+        # Saves are written one at a time in the background, in the order queued
+        self.save_pool = QThreadPool(self)
+        self.save_pool.setMaxThreadCount(1)
+        self.save_tasks = []
+        self.failed_saves = 0
+        
+        # Saved forms are kept next to the settings file
+        settings_dir = preferences.directory()
+        metrics.configure(
+            str(preferences.get("metrics_enabled", "false")).lower() == "true",
+            os.path.join(settings_dir, "metrics.jsonl")
+        )
+        self.history = JobHistory(os.path.join(settings_dir, "history.sqlite3"))
+        
+        # Past vehicles are suggested while typing their registration or model number
+        self.vehicle_index = VehicleIndex()
+        self.vehicle_index.load(self.history)
+        self.setup_vehicle_completer(self.form_fields["Registration number:"], "registration")
+        self.setup_vehicle_completer(self.form_fields["Model number:"], "model")
+        self.due_dates = DueDateIndex()
+        self.due_dates.load(self.history)
+
+        # Unsaved edits are journaled once typing pauses, so keystrokes only restart a timer
+        self.journal = RecoveryJournal(os.path.join(settings_dir, "recovery.journal"))
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setSingleShot(True)
+        self.journal_timer.setInterval(1000)
+        self.journal_timer.timeout.connect(self.flush_journal)
+        self.journal_dirty_since = None
+        for field in self.form_fields.values():
+            field.textChanged.connect(self.schedule_journal)
+        for group in (self.looked_items, self.parts_replacement):
+            group.changed.connect(self.schedule_journal)
+        self.journal_restored = False
+        self.pending_launch = None  # Files to open once the restore is decided
+        QTimer.singleShot(0, self.restore_from_journal)
+
+        # Parse the print fonts once the window is up, before the first print needs them
+        QTimer.singleShot(0, self.warm_up_fonts)
+        
+        # Printer and preview objects are reused by every print; they are created
+        # on the GUI thread, so do it once startup has settled rather than on the first click
+        self.print_handler = PrintHandler(self)
+        QTimer.singleShot(1000, self, self.print_handler.warm_up)
 
     def create_menu_bar(self):
         menubar = self.menuBar()
@@ -285,6 +2008,19 @@ class CarForm(QMainWindow):
         save_action = file_menu.addAction("Save")
         save_action.setShortcut(QKeySequence("Ctrl+S"))
         
+        history_action = file_menu.addAction("Open from history")
+        history_action.setShortcut(QKeySequence("Ctrl+O"))
+        history_action.triggered.connect(self.show_history_dialog)
+        
+        export_history_action = file_menu.addAction("Export history...")
+        export_history_action.triggered.connect(self.export_history)
+        
+        import_history_action = file_menu.addAction("Import into history...")
+        import_history_action.triggered.connect(self.import_history)
+        
+        due_action = file_menu.addAction("Due dates...")
+        due_action.triggered.connect(self.show_due_dates_dialog)
+        
         print_action = file_menu.addAction("Print")
         print_action.setShortcut(QKeySequence("Ctrl+P"))
         print_action.triggered.connect(self.print_to_pdf)
@@ -309,6 +2045,9 @@ class CarForm(QMainWindow):
         reset_pane_action.setShortcut("Ctrl+D")  # Changed from QKeySequence to string
         reset_pane_action.triggered.connect(self.center_window)
         
+        metrics_action = view_menu.addAction("Performance metrics")
+        metrics_action.triggered.connect(self.show_metrics_dialog)
+        
         # Help menu
         help_menu = menubar.addMenu("Help")
         about_action = help_menu.addAction("About")
@@ -353,9 +2092,10 @@ class CarForm(QMainWindow):
         clicked_button = msg_box.clickedButton()
         if clicked_button == save_button:
             # Only close if save was successful
-            if self.save_file():
+            if self.save_file() and self.wait_for_saves():
                 self.close()
         elif clicked_button == discard_button:
+            self.clear_journal()
             self.close()
         # Do nothing if Cancel was clicked, allowing user to continue editing
 
@@ -367,73 +2107,70 @@ class CarForm(QMainWindow):
                 return False
         
         # Check looked items
-        for container, field, _ in self.looked_items.fields:
-            if container.isVisible() and not field.text().strip():
+        for text in self.looked_items.values():
+            if not text.strip():
                 return False
         
         # Check parts replacement
-        for container, field, _ in self.parts_replacement.fields:
-            if container.isVisible() and not field.text().strip():
+        for text in self.parts_replacement.values():
+            if not text.strip():
                 return False
         
         return True
 
     def export_csv(self, file_name):
-        """Export form data to CSV with Japanese text support"""
+        """Export form data to CSV with Japanese text support
+
+        The file is written in the background. Returns True once the save
+        is queued; the result is reported by on_save_finished/on_save_failed.
+        """
+        # Collect all data
+        business_info = {key: preferences.get(key, "") for key, _ in PREFERENCE_ITEMS}
+        task = SaveTask(file_name, self.collect_form_data(), business_info)
+        
+        # Keep the task referenced until it reports back
+        task.setAutoDelete(False)
+        task.signals.finished.connect(self.on_save_finished)
+        task.signals.failed.connect(self.on_save_failed)
+        self.save_tasks.append(task)
+        self.save_pool.start(task)
+        self.statusBar().showMessage(f"Saving {os.path.basename(file_name)}...")
+        return True
+
+    def on_save_finished(self, task):
+        """Record a completed save in the job history"""
+        self.save_tasks.remove(task)
+        # Keep journaling whatever was typed after the save was queued
+        self.clear_journal()
+        if self.collect_form_data() != task.form_data:
+            self.schedule_journal()
         try:
-            # Prepare headers
-            headers = ['Item', 'Value']
-            
-            # Collect all data
-            rows = []
-            
-            # Add preference fields first (A13-B13)
-            settings = QSettings()
-            preference_fields = [
-                ("Business name", settings.value("business_name", "")),
-                ("Address", settings.value("address", "")),
-                ("Telephone number", settings.value("phone_number", "")),
-                ("Cellphone number", settings.value("cellphone_number", ""))
-            ]
-            rows.extend(preference_fields)
-            
-            # Add main form fields
-            for label, field in self.form_fields.items():
-                rows.append([label.strip(':'), field.text()])
-            
-            # Add looked items
-            for i, (container, field, _) in enumerate(self.looked_items.fields):
-                if container.isVisible():
-                    label = f"Looked item{i+1 if i > 0 else ''}"
-                    rows.append([label, field.text()])
-            
-            # Add parts replacement
-            for i, (container, field, _) in enumerate(self.parts_replacement.fields):
-                if container.isVisible():
-                    label = f"Parts replacement{i+1 if i > 0 else ''}"
-                    rows.append([label, field.text()])
-            
-            # Write CSV file
-            import csv
-            with open(file_name, 'w', encoding='utf-8-sig', newline='') as f:
-                writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-                # Write header
-                writer.writerow(headers)
-                # Write data rows
-                writer.writerows(rows)
-                
-            QMessageBox.information(
-                self,
-                "Success",
-                "Data exported successfully."
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Export failed: {str(e)}"
-            )
+            with metrics.phase("save.history"):
+                job_id = self.history.add(task.form_data, task.business_info)
+            self.vehicle_index.add_job(job_id, task.form_data["fields"])
+            self.due_dates.add_job(job_id, task.form_data["fields"])
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Warning", f"Could not record job history: {str(e)}")
+        self.statusBar().showMessage(f"Data exported to {os.path.basename(task.file_name)}.", 5000)
+
+    def on_save_failed(self, task, message):
+        """Report a failed save"""
+        self.save_tasks.remove(task)
+        self.failed_saves += 1
+        self.statusBar().clearMessage()
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Export failed: {message}"
+        )
+
+    def wait_for_saves(self):
+        """Block until queued saves are written, returning False if any of them failed"""
+        failed_before = self.failed_saves
+        self.save_pool.waitForDone()
+        # Deliver the queued completion signals
+        QApplication.processEvents()
+        return self.failed_saves == failed_before
 
     def save_file(self):
         """Save File"""
@@ -475,14 +2212,12 @@ class CarForm(QMainWindow):
                     f.write(f"{label}: {field.text()}\n")
                 
                 # Save looked items
-                for container, field, _ in self.looked_items.fields:
-                    if container.isVisible():
-                        f.write(f"Looked item: {field.text()}\n")
+                for text in self.looked_items.values():
+                    f.write(f"Looked item: {text}\n")
                 
                 # Save parts replacement
-                for container, field, _ in self.parts_replacement.fields:
-                    if container.isVisible():
-                        f.write(f"Parts replacement: {field.text()}\n")
+                for text in self.parts_replacement.values():
+                    f.write(f"Parts replacement: {text}\n")
                         
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save file: {str(e)}")
@@ -493,22 +2228,245 @@ class CarForm(QMainWindow):
         for field in self.form_fields.values():
             field.clear()
         
-        # Reset looked items
-        for container, field, _ in self.looked_items.fields:
-            field.clear()  # Clear the field content
-            if container != self.looked_items.fields[0][0]:  # If not the first container
-                container.hide()  # Hide additional containers
-        self.looked_items.visible_count = 1
-        
-        # Reset parts replacement
-        for container, field, _ in self.parts_replacement.fields:
-            field.clear()  # Clear the field content
-            if container != self.parts_replacement.fields[0][0]:  # If not the first container
-                container.hide()  # Hide additional containers
-        self.parts_replacement.visible_count = 1
+        # Reset looked items and parts replacement to a single empty row
+        self.looked_items.set_values([])
+        self.parts_replacement.set_values([])
         
         # Adjust window size after clearing
         self.adjustSize()
+        self.clear_journal()
+
+    def setup_vehicle_completer(self, field, kind):
+        """Suggest past registration or model numbers in field"""
+        model = QStringListModel(self)
+        completer = QCompleter(model, self)
+        # The index already filtered the suggestions by prefix
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        field.setCompleter(completer)
+        
+        def on_text_edited(text):
+            model.setStringList(self.vehicle_index.complete(kind, text))
+            if model.rowCount():
+                completer.complete()
+        
+        field.textEdited.connect(on_text_edited)
+        completer.activated[str].connect(lambda text: self.prefill_from_last_job(kind, text))
+
+    def prefill_from_last_job(self, kind, text):
+        """Fill in the vehicle's details from its newest job
+
+        Empty fields are filled, except the dates and travel distance that
+        belong to the new visit. The lists are copied only if still empty.
+        """
+        job_id = self.vehicle_index.last_job(kind, text)
+        job = self.history.get(job_id) if job_id is not None else None
+        if job is None:
+            return
+        form_data, _ = job
+        for label, field in self.form_fields.items():
+            if label.startswith(("Checked", "Maintained", "Travel")):
+                continue
+            if not field.text().strip():
+                field.setText(form_data["fields"].get(label, ""))
+        for group, name in ((self.looked_items, "looked_items"), (self.parts_replacement, "parts_replacement")):
+            if not any(value.strip() for value in group.values()):
+                group.set_values(form_data[name])
+
+    def load_form_data(self, form_data):
+        """Fill the form with previously saved values"""
+        for label, field in self.form_fields.items():
+            field.setText(form_data["fields"].get(label, ""))
+        self.looked_items.set_values(form_data["looked_items"])
+        self.parts_replacement.set_values(form_data["parts_replacement"])
+        self.adjustSize()
+
+    def show_history_dialog(self):
+        """Show saved jobs and reopen the selected one"""
+        opened = metrics.timer("dialog.history")
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Open from history")
+        dialog.resize(700, 450)
+        layout = QVBoxLayout(dialog)
+        
+        search_field = QLineEdit()
+        search_field.setPlaceholderText("Registration number or model number")
+        self.setup_form_field(search_field)
+        layout.addWidget(search_field)
+        
+        table = QTableWidget(0, 5)
+        table.setHorizontalHeaderLabels(
+            ["Saved", "Registration number", "Model number", "Checked", "Maintained"]
+        )
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(table)
+        
+        def refresh():
+            try:
+                rows = self.history.search(search_field.text().strip())
+            except sqlite3.Error as e:
+                QMessageBox.critical(dialog, "Error", f"Could not read job history: {str(e)}")
+                return
+            table.setRowCount(len(rows))
+            for row, (job_id, *values) in enumerate(rows):
+                for column, value in enumerate(values):
+                    item = QTableWidgetItem(value)
+                    item.setData(Qt.UserRole, job_id)
+                    table.setItem(row, column, item)
+            if rows:
+                table.selectRow(0)
+        
+        # Search once typing pauses
+        search_timer = QTimer(dialog)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(150)
+        search_timer.timeout.connect(refresh)
+        search_field.textChanged.connect(search_timer.start)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        open_button = QPushButton("Open")
+        cancel_button = QPushButton("Cancel")
+        button_layout.addWidget(open_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        open_button.clicked.connect(dialog.accept)
+        cancel_button.clicked.connect(dialog.reject)
+        table.itemDoubleClicked.connect(dialog.accept)
+        
+        refresh()
+        QTimer.singleShot(0, opened)  # Runs once the dialog is shown
+        if dialog.exec() == QDialog.Accepted and table.currentItem() is not None:
+            job = self.history.get(table.currentItem().data(Qt.UserRole))
+            if job is not None:
+                self.load_form_data(job[0])
+
+    def show_due_dates_dialog(self):
+        """Show vehicles whose inspection or maintenance falls due soon and reopen one"""
+        opened = metrics.timer("dialog.due_dates")
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Due dates")
+        dialog.resize(700, 450)
+        layout = QVBoxLayout(dialog)
+        
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Due within"))
+        days_field = QSpinBox()
+        days_field.setRange(0, 3650)
+        days_field.setValue(30)
+        days_field.setSuffix(" days")
+        filter_layout.addWidget(days_field)
+        overdue_field = QCheckBox("Include overdue")
+        filter_layout.addWidget(overdue_field)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+        
+        table = QTableWidget(0, 4)
+        table.setHorizontalHeaderLabels(["Due", "Type", "Registration number", "Last done"])
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(table)
+        
+        def refresh():
+            today = QDate.currentDate()
+            start = "" if overdue_field.isChecked() else today.toString("yyyyMMdd")
+            end = today.addDays(days_field.value()).toString("yyyyMMdd")
+            rows = self.due_dates.between(start, end)
+            table.setRowCount(len(rows))
+            for row, (*values, job_id) in enumerate(rows):
+                for column, value in enumerate(values):
+                    item = QTableWidgetItem(value)
+                    item.setData(Qt.UserRole, job_id)
+                    table.setItem(row, column, item)
+            if rows:
+                table.selectRow(0)
+        
+        days_field.valueChanged.connect(refresh)
+        overdue_field.toggled.connect(refresh)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        open_button = QPushButton("Open")
+        cancel_button = QPushButton("Cancel")
+        button_layout.addWidget(open_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        open_button.clicked.connect(dialog.accept)
+        cancel_button.clicked.connect(dialog.reject)
+        table.itemDoubleClicked.connect(dialog.accept)
+        
+        refresh()
+        QTimer.singleShot(0, opened)  # Runs once the dialog is shown
+        if dialog.exec() == QDialog.Accepted and table.currentItem() is not None:
+            try:
+                job = self.history.get(table.currentItem().data(Qt.UserRole))
+            except sqlite3.Error as e:
+                QMessageBox.critical(self, "Error", f"Could not read job history: {str(e)}")
+                return
+            if job is not None:
+                self.load_form_data(job[0])
+
+    def export_history(self):
+        """Export every saved job into one bulk file"""
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export history",
+            os.path.join(os.path.expanduser("~"), "Desktop", "CarForm_history.parquet"),
+            "Parquet Files (*.parquet);;Feather Files (*.feather);;CSV Files (*.csv)",
+            options=QFileDialog.DontUseNativeDialog
+        )
+        if not file_name:
+            return
+        
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            count = export_forms_bulk(self.history.iter_jobs(), file_name)
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, "Error", f"Export failed: {str(e)}")
+            return
+        QApplication.restoreOverrideCursor()
+        QMessageBox.information(self, "Success", f"Exported {count} forms.")
+
+    def import_history(self):
+        """Import forms from bulk files or per-form CSVs into the job history"""
+        file_names, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Import into history",
+            os.path.join(os.path.expanduser("~"), "Desktop"),
+            "Form Files (*.parquet *.feather *.csv *.jsonl);;All Files (*)",
+            options=QFileDialog.DontUseNativeDialog
+        )
+        if not file_names:
+            return
+        
+        def jobs():
+            for file_name in file_names:
+                for items in read_form_records(file_name):
+                    form_data, business_info = normalizer.normalize_form(*form_data_from_items(items, {}))
+                    yield form_data, business_info, items.get("Saved at") or None
+        
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            count = self.history.add_many(jobs())
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, "Error", f"Import failed: {str(e)}")
+            return
+        QApplication.restoreOverrideCursor()
+        self.vehicle_index.load(self.history)
+        self.due_dates.load(self.history)
+        QMessageBox.information(self, "Success", f"Imported {count} forms.")
 
     def print_form(self):
         print("Printing form...")
@@ -547,6 +2505,7 @@ class CarForm(QMainWindow):
 
     def show_about_dialog(self):
         """Show About dialog similar to winver"""
+        opened = metrics.timer("dialog.about")
         dialog = QDialog(self)
         dialog.setWindowFlags(Qt.Dialog | Qt.WindowCloseButtonHint)
         dialog.setWindowTitle("About CarForm")
@@ -559,15 +2518,7 @@ class CarForm(QMainWindow):
         
         # Top image (CarForm logo)
         top_image_label = QLabel()
-        # Fix logo path loading
-        if self.detect_system_theme():
-            logo_path = QPixmap(resource_path("Darkmode_CarForm_logo.png"))
-        else:
-            logo_path = QPixmap(resource_path("Lightmode_CarForm_logo.png"))
-            
-        top_pixmap = QPixmap(logo_path)
-        top_pixmap = top_pixmap.scaled(300, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        top_image_label.setPixmap(top_pixmap)
+        top_image_label.setPixmap(assets.logo(300, 150))
         top_image_label.setAlignment(Qt.AlignCenter)  # Keep image centered
 
         # Separator line
@@ -637,18 +2588,12 @@ class CarForm(QMainWindow):
         
         # GPL license image
         gpl_label = QLabel()
-        # Fix GPL logo loading
-        gpl_pixmap = QPixmap(resource_path("lgplv3-with-text-154x68.png"))
-        gpl_pixmap = gpl_pixmap.scaled(200, 88, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        gpl_label.setPixmap(gpl_pixmap)
+        gpl_label.setPixmap(assets.pixmap("lgplv3-with-text-154x68.png", 200, 88))
         gpl_label.setAlignment(Qt.AlignCenter)
         
         # PySide logo
         pyside_label = QLabel()
-        # Fix PySide logo loading
-        pyside_pixmap = QPixmap(resource_path("PySideLogo1.png"))
-        pyside_pixmap = pyside_pixmap.scaled(200, 88, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        pyside_label.setPixmap(pyside_pixmap)
+        pyside_label.setPixmap(assets.pixmap("PySideLogo1.png", 200, 88))
         pyside_label.setAlignment(Qt.AlignCenter)
         
         # Add images to container
@@ -676,20 +2621,9 @@ class CarForm(QMainWindow):
         layout.addWidget(button_container)
         
         # Show dialog
+        QTimer.singleShot(0, opened)  # Runs once the dialog is shown
         dialog.exec()
 
-    def detect_system_theme(self):
-        """Detect if system is using dark mode"""
-        try:
-            import winreg
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize"
-            ) as key:
-                return not winreg.QueryValueEx(key, "AppsUseLightTheme")[0]
-        except:
-            return False  # Default to light mode if detection fails
-
     def center_window(self):
         """Center the window on the screen and reset size"""
         # Reset window size to minimum
@@ -710,35 +2644,94 @@ class CarForm(QMainWindow):
         self.move(window_geometry.topLeft())
 
     def convert_fullwidth_to_halfwidth(self, text):
-        """Convert full-width numerics, alphabets and spaces to half-width while preserving other characters"""
-        # Full-width to half-width mapping for numbers, alphabets (upper and lower) and space
-        fw_chars = ('０１２３４５６７８９' +  # Numbers
-                   'ａｂｃｄｅｆｇｈｉｊｋｌｍｎｏｐｑｒｓｔｕｖｗｘｙｚ' +  # Lowercase
-                   'ＡＢＣＤＥＦＧＨＩＪＫＬＭＮＯＰＱＲＳＴＵＶＷＸＹＺ' +  # Uppercase
-                   '　')  # Full-width space
-        hw_chars = ('0123456789' +  # Numbers
-                   'abcdefghijklmnopqrstuvwxyz' +  # Lowercase
-                   'ABCDEFGHIJKLMNOPQRSTUVWXYZ' +  # Uppercase
-                   ' ')  # Half-width space
-        
-        # Create translation table
-        fw_to_hw = str.maketrans(fw_chars, hw_chars)
-        return text.translate(fw_to_hw)
+        """Convert full-width characters to half-width while preserving other characters"""
+        return normalizer.normalize(text)
 
     def setup_form_field(self, field):
         """Set up form field with character conversion"""
-        def on_text_changed():
+        # unconverted is the text as typed before the last conversion
+        state = {"text": field.text(), "converting": False, "unconverted": None}
+        
+        def on_text_changed(text):
+            previous = state["text"]
+            state["text"] = text
+            if state["converting"]:
+                return
+            
+            # Undoing a conversion brings back the text as typed; leave it,
+            # so the next undo can reach what was there before
+            unconverted, state["unconverted"] = state["unconverted"], None
+            if text == unconverted:
+                return
+            
+            # Only look at the characters that were just inserted
+            change = normalizer.normalize_insertion(previous, text)
+            if change is None:
+                return
+            
+            # Replace in place so the cursor and undo history stay put
+            start, end, replacement = change
             cursor_pos = field.cursorPosition()
-            text = field.text()
-            new_text = self.convert_fullwidth_to_halfwidth(text)
-            if new_text != text:
-                field.setText(new_text)
-                field.setCursorPosition(cursor_pos)
+            state["converting"] = True
+            try:
+                field.setSelection(start, end - start)
+                field.insert(replacement)
+            finally:
+                state["converting"] = False
+            state["unconverted"] = text
+            field.setCursorPosition(cursor_pos)
         
         field.textChanged.connect(on_text_changed)
 
+    def show_metrics_dialog(self):
+        """Show rolling percentiles of the recorded timings"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Performance metrics")
+        dialog.resize(600, 400)
+        layout = QVBoxLayout(dialog)
+        
+        if metrics.enabled:
+            status = f"Recording to {metrics.path}"
+        else:
+            status = "Recording is off. Turn it on in Preference or set CARFORM_METRICS=1."
+        status_label = QLabel(status)
+        status_label.setWordWrap(True)
+        layout.addWidget(status_label)
+        
+        columns = ["Phase", "Count", "p50 ms", "p90 ms", "p99 ms", "Max ms"]
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(table)
+        
+        def refresh():
+            rows = metrics.summary()
+            table.setRowCount(len(rows))
+            for row, (name, count, *timings) in enumerate(rows):
+                table.setItem(row, 0, QTableWidgetItem(name))
+                table.setItem(row, 1, QTableWidgetItem(str(count)))
+                for column, ms in enumerate(timings, 2):
+                    table.setItem(row, column, QTableWidgetItem(f"{ms:.1f}"))
+            table.resizeColumnToContents(0)
+        refresh()
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        refresh_button = QPushButton("Refresh")
+        close_button = QPushButton("Close")
+        refresh_button.clicked.connect(refresh)
+        close_button.clicked.connect(dialog.accept)
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+        
+        dialog.exec()
+
     def show_calendar_dialog(self, year_field, month_field, day_field):
         """Show calendar dialog and update date fields"""
+        opened = metrics.timer("dialog.calendar")
         dialog = QDialog(self)
         dialog.setWindowTitle("Select Date")
         layout = QVBoxLayout(dialog)
@@ -762,6 +2755,7 @@ class CarForm(QMainWindow):
         ok_button.clicked.connect(dialog.accept)
         layout.addWidget(ok_button)
         
+        QTimer.singleShot(0, opened)  # Runs once the dialog is shown
         if dialog.exec() == QDialog.Accepted:
             selected_date = calendar.selectedDate()
 
@@ -772,9 +2766,10 @@ class CarForm(QMainWindow):
 
     def show_preferences(self):
         """Show preferences dialog"""
+        opened = metrics.timer("dialog.preferences")
         dialog = QDialog(self)
         dialog.setWindowTitle("Preferences")
-        dialog.setFixedSize(500, 400)
+        dialog.setFixedSize(500, 660)
         
         # Main layout
         main_layout = QVBoxLayout(dialog)
@@ -852,6 +2847,77 @@ class CarForm(QMainWindow):
         
         # Add to content layout
         layout.addWidget(phone_group)
+        
+        # Printing section
+        printing_group = QFrame()
+        printing_group.setFrameStyle(QFrame.StyledPanel)
+        printing_layout = QVBoxLayout(printing_group)
+        
+        printing_label = QLabel("Printing")
+        printing_label.setStyleSheet("font-weight: bold;")
+        printing_layout.addWidget(printing_label)
+        
+        # Print backend selection
+        backend_layout = QHBoxLayout()
+        backend_label = QLabel("Print backend:")
+        self.backend_field = QComboBox()
+        self.backend_field.addItem("Raster (image)", "raster")
+        self.backend_field.addItem("Vector (searchable text)", "vector")
+        
+        backend_layout.addWidget(backend_label)
+        backend_layout.addWidget(self.backend_field)
+        printing_layout.addLayout(backend_layout)
+        
+        # Form layout template selection
+        layout_template_layout = QHBoxLayout()
+        layout_template_label = QLabel("Form layout:")
+        self.layout_template_field = QComboBox()
+        self.layout_template_field.addItems(available_layouts())
+        
+        layout_template_layout.addWidget(layout_template_label)
+        layout_template_layout.addWidget(self.layout_template_field)
+        printing_layout.addLayout(layout_template_layout)
+        
+        # Preview resolution selection
+        preview_resolution_layout = QHBoxLayout()
+        preview_resolution_label = QLabel("Preview resolution:")
+        self.preview_resolution_field = QComboBox()
+        self.preview_resolution_field.addItem("Screen (fast)", "screen")
+        self.preview_resolution_field.addItem("Full (same as printed)", "full")
+        
+        preview_resolution_layout.addWidget(preview_resolution_label)
+        preview_resolution_layout.addWidget(self.preview_resolution_field)
+        printing_layout.addLayout(preview_resolution_layout)
+        
+        # Raster page encoding selection
+        encoding_layout = QHBoxLayout()
+        encoding_label = QLabel("Raster colors:")
+        self.encoding_field = QComboBox()
+        self.encoding_field.addItem("Color (24-bit)", "rgb")
+        self.encoding_field.addItem("Grayscale (8-bit)", "grayscale")
+        self.encoding_field.addItem("Black and white (1-bit, smallest)", "bilevel")
+        
+        encoding_layout.addWidget(encoding_label)
+        encoding_layout.addWidget(self.encoding_field)
+        printing_layout.addLayout(encoding_layout)
+        
+        # Add to content layout
+        layout.addWidget(printing_group)
+        
+        # Diagnostics section
+        diagnostics_group = QFrame()
+        diagnostics_group.setFrameStyle(QFrame.StyledPanel)
+        diagnostics_layout = QVBoxLayout(diagnostics_group)
+        
+        diagnostics_label = QLabel("Diagnostics")
+        diagnostics_label.setStyleSheet("font-weight: bold;")
+        diagnostics_layout.addWidget(diagnostics_label)
+        
+        self.metrics_field = QCheckBox("Record performance metrics")
+        diagnostics_layout.addWidget(self.metrics_field)
+        
+        # Add to content layout
+        layout.addWidget(diagnostics_group)
         layout.addStretch()
         
         # Button container
@@ -885,6 +2951,7 @@ class CarForm(QMainWindow):
         # Load saved preferences
         self.load_preferences()
         
+        QTimer.singleShot(0, opened)  # Runs once the dialog is shown
         if dialog.exec() == QDialog.Accepted:
             self.save_preferences()
 
@@ -904,13 +2971,20 @@ class CarForm(QMainWindow):
             self.address_field.clear()
             self.tel_field.clear()
             self.cel_field.clear()
+            self.backend_field.setCurrentIndex(self.backend_field.findData("raster"))
+            self.layout_template_field.setCurrentText("default")
+            self.preview_resolution_field.setCurrentIndex(self.preview_resolution_field.findData("screen"))
+            self.encoding_field.setCurrentIndex(self.encoding_field.findData("rgb"))
+            self.metrics_field.setChecked(False)
             
-            # Clear settings in QSettings
-            settings = QSettings()
-            settings.remove("business_name")
-            settings.remove("address")
-            settings.remove("phone_number")
-            settings.remove("cellphone_number")
+            # Clear the saved settings
+            preferences.set_many({
+                key: None for key in (
+                    "business_name", "address", "phone_number", "cellphone_number",
+                    "print_backend", "layout_template", "preview_resolution", "raster_encoding",
+                    "metrics_enabled"
+                )
+            })
             
             # Show confirmation
             QMessageBox.information(
@@ -919,20 +2993,6 @@ class CarForm(QMainWindow):
                 "All settings have been restored to defaults."
             )
 
-    def save_preferences(self):
-        """Save preferences"""
-        settings = QSettings()
-        settings.setValue("business_name", self.business_name_field.text())
-        settings.setValue("address", self.address_field.text())
-        settings.setValue("phone_number", self.tel_field.text())
-        settings.setValue("cellphone_number", self.cel_field.text())
-        
-        # Show save confirmation
-        QMessageBox.information(
-            self,
-            "Settings Saved",
-            "Your preferences have been saved successfully.")
-
     def browse_save_location(self):
         """Open directory browser for default save location"""
         directory = QFileDialog.getExistingDirectory(
@@ -945,133 +3005,676 @@ class CarForm(QMainWindow):
 
     def load_preferences(self):
         """Load saved preferences"""
-        settings = QSettings()
-        business_name = settings.value("business_name", "")
-        address = settings.value("address", "")
+        business_name = preferences.get("business_name", "")
+        address = preferences.get("address", "")
         self.business_name_field.setText(business_name)
         self.address_field.setText(address)
-        phone_number = settings.value("phone_number", "")
+        phone_number = preferences.get("phone_number", "")
         self.tel_field.setText(phone_number)
-        cellphone_number = settings.value("cellphone_number", "")
+        cellphone_number = preferences.get("cellphone_number", "")
         self.cel_field.setText(cellphone_number)
+        backend_index = self.backend_field.findData(preferences.get("print_backend", "raster"))
+        self.backend_field.setCurrentIndex(max(backend_index, 0))
+        layout_template = preferences.get("layout_template", "default")
+        if self.layout_template_field.findText(layout_template) < 0:
+            # A template file outside the layouts directory
+            self.layout_template_field.addItem(layout_template)
+        self.layout_template_field.setCurrentText(layout_template)
+        preview_index = self.preview_resolution_field.findData(preferences.get("preview_resolution", "screen"))
+        self.preview_resolution_field.setCurrentIndex(max(preview_index, 0))
+        encoding_index = self.encoding_field.findData(preferences.get("raster_encoding", "rgb"))
+        self.encoding_field.setCurrentIndex(max(encoding_index, 0))
+        self.metrics_field.setChecked(str(preferences.get("metrics_enabled", "false")).lower() == "true")
 
     def save_preferences(self):
         """Save preferences"""
-        settings = QSettings()
-        settings.setValue("business_name", self.business_name_field.text())
-        settings.setValue("address", self.address_field.text())
-        settings.setValue("phone_number", self.tel_field.text())
-        settings.setValue("cellphone_number", self.cel_field.text())
+        preferences.set_many({
+            "business_name": self.business_name_field.text(),
+            "address": self.address_field.text(),
+            "phone_number": self.tel_field.text(),
+            "cellphone_number": self.cel_field.text(),
+            "print_backend": self.backend_field.currentData(),
+            "layout_template": self.layout_template_field.currentText(),
+            "preview_resolution": self.preview_resolution_field.currentData(),
+            "raster_encoding": self.encoding_field.currentData(),
+            "metrics_enabled": "true" if self.metrics_field.isChecked() else "false"
+        })
 
 
     def print_to_pdf(self):
         """Print form data to PDF"""
-        handler = PrintHandler(self)
-        handler.print_preview()
+        if self.render_task is not None:
+            return  # The page is still being rendered
+        
+        try:
+            business_info = {key: preferences.get(key, "") for key, _ in PREFERENCE_ITEMS}
+            layout = current_layout()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to print: {str(e)}")
+            return
+        
+        # Render the pages in the background first, the preview then only composites them
+        if preferences.get("print_backend", "raster") != "vector":
+            if preferences.get("preview_resolution", "screen") == "screen":
+                layout = preview_layout(self.print_handler.session()[0], layout)
+            encoding = self.raster_encoding()
+            pages = []
+            for page_data in form_pages(self.collect_form_data(), layout):
+                cache_key = page_cache_key(page_data, business_info, layout, encoding)
+                if self.render_cache.get(cache_key) is None:
+                    pages.append((cache_key, page_data))
+            # Pages beyond what the cache holds are rendered while painting instead
+            pages = pages[:self.render_cache.capacity(layout.page_size, encoding)]
+            if pages:
+                # Keep the task referenced until it reports back
+                task = RenderTask(pages, business_info, layout, encoding)
+                task.setAutoDelete(False)
+                self.render_task = task
+                task.signals.progress.connect(self.render_progress.setValue)
+                task.signals.page_rendered.connect(self.on_page_rendered)
+                task.signals.finished.connect(self.on_render_finished)
+                task.signals.failed.connect(self.on_render_failed)
+                self.render_progress.setValue(0)
+                self.render_progress.show()
+                self.statusBar().showMessage("Rendering pages...")
+                self.render_pool.start(task)
+                return
+        
+        self.open_print_preview()
+
+    def raster_encoding(self):
+        """The raster page encoding chosen in preferences"""
+        encoding = preferences.get("raster_encoding", "rgb")
+        return encoding if encoding in RASTER_ENCODINGS else "rgb"
+
+    def open_print_preview(self):
+        """Show the print preview"""
+        self.print_handler.print_preview()
+
+    def nativeEvent(self, event_type, message):
+        """Drop the print session or the cached theme when Windows reports a change"""
+        if event_type == b"windows_generic_MSG":
+            from ctypes import wintypes, wstring_at
+
+            msg = wintypes.MSG.from_address(int(message))
+            # WM_SETTINGCHANGE names "windows" when the default printer changes
+            # and "ImmersiveColorSet" when the light or dark theme changes
+            area = wstring_at(msg.lParam) if msg.message == WM_SETTINGCHANGE and msg.lParam else None
+            if msg.message == WM_DEVMODECHANGE or area == "windows":
+                self.print_handler.invalidate()
+            elif area == "ImmersiveColorSet":
+                assets.theme_changed()
+        return super().nativeEvent(event_type, message)
+
+    def on_page_rendered(self, cache_key, page_image):
+        """Store a page rendered in the background"""
+        self.render_cache.put(cache_key, page_image)
+
+    def on_render_finished(self):
+        """Show the preview once the pages are rendered in the background"""
+        self.render_task = None
+        self.render_progress.hide()
+        self.statusBar().clearMessage()
+        self.open_print_preview()
+
+    def on_render_failed(self, message):
+        """Report a failed background render"""
+        self.render_task = None
+        self.render_progress.hide()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", f"Failed to print: {message}")
+
+    def warm_up_fonts(self):
+        """Start loading the fonts of the current layout"""
+        try:
+            font_registry.warm_up(current_layout().fonts())
+        except (OSError, ValueError):
+            pass  # Reported when printing
+
+    def on_preferences_changed(self, keys):
+        """Drop cached fonts and pages that depend on changed settings"""
+        if "font_fallbacks" in keys:
+            font_registry.clear()
+            self.render_cache.clear()
+        if "font_fallbacks" in keys or "layout_template" in keys:
+            self.warm_up_fonts()
+        if "metrics_enabled" in keys:
+            metrics.configure(
+                str(preferences.get("metrics_enabled", "false")).lower() == "true", metrics.path
+            )
+
+    def schedule_journal(self):
+        """Journal the form once edits pause, or every few seconds while typing"""
+        now = time.monotonic()
+        if self.journal_dirty_since is None:
+            self.journal_dirty_since = now
+        if now - self.journal_dirty_since > 5:
+            self.flush_journal()
+        else:
+            self.journal_timer.start()
+
+    def flush_journal(self):
+        """Append pending edits to the recovery journal"""
+        self.journal_timer.stop()
+        self.journal_dirty_since = None
+        try:
+            self.journal.record(self.collect_form_data())
+        except OSError as e:
+            self.statusBar().showMessage(f"Could not write recovery journal: {str(e)}", 5000)
+
+    def clear_journal(self):
+        """Drop journaled edits once they are saved or discarded"""
+        self.journal_timer.stop()
+        self.journal_dirty_since = None
+        self.journal.clear()
+
+    def open_file(self, path):
+        """Fill the form from the first record of a saved form file"""
+        try:
+            items = next(read_form_records(path), None)
+            if items is not None:
+                form_data, _ = normalizer.normalize_form(*form_data_from_items(items, {}))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not open {os.path.basename(path)}: {str(e)}")
+            return
+        if items is None:
+            QMessageBox.warning(self, "Warning", f"No form found in {os.path.basename(path)}.")
+            return
+        if self.has_unsaved_changes() and not self.confirm_replace_form(os.path.basename(path)):
+            return
+        self.load_form_data(form_data)
+        self.statusBar().showMessage(f"Opened {os.path.basename(path)}.", 5000)
+
+    def has_unsaved_changes(self):
+        """Whether the form holds edits that haven't been saved"""
+        if self.journal_timer.isActive():
+            self.flush_journal()
+        # The journal is cleared on save, so anything in it is unsaved
+        return any(value for key, value in self.journal.state.items() if not key.endswith("/count"))
+
+    def confirm_replace_form(self, file_name):
+        """Offer to save the current form before it is replaced, False on Cancel"""
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("Open")
+        msg_box.setText(f"Do you want to save changes before opening {file_name}?")
+        msg_box.setIcon(QMessageBox.Question)
+        
+        save_button = msg_box.addButton("Save", QMessageBox.AcceptRole)
+        discard_button = msg_box.addButton("Don't Save", QMessageBox.DestructiveRole)
+        cancel_button = msg_box.addButton("Cancel", QMessageBox.RejectRole)
+        
+        msg_box.setDefaultButton(save_button)
+        msg_box.exec()
+        
+        clicked_button = msg_box.clickedButton()
+        if clicked_button == save_button:
+            # Keep the form if save was cancelled or failed
+            return bool(self.save_file())
+        return clicked_button == discard_button
+
+    def open_launch_arguments(self, args):
+        """Bring the window to the front and open the file a launch was given"""
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        if not args:
+            return
+        if not self.journal_restored:
+            # A restored journal would overwrite the file, open it afterwards
+            self.pending_launch = args
+            return
+        self.open_file(args[-1])  # One form at a time, the last one wins
+
+    def restore_from_journal(self):
+        """Offer to restore a form left unsaved by the last session"""
+        try:
+            self.ask_restore_journal()
+        finally:
+            self.journal_restored = True
+            if self.pending_launch is not None:
+                args, self.pending_launch = self.pending_launch, None
+                self.open_launch_arguments(args)
+
+    def ask_restore_journal(self):
+        try:
+            form_data = self.journal.replay()
+        except OSError:
+            form_data = None
+        if form_data is None:
+            self.clear_journal()
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Restore Unsaved Form",
+            "The last session ended with unsaved changes. Restore them?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        if reply == QMessageBox.Yes:
+            self.load_form_data(form_data)
+            self.flush_journal()
+        else:
+            self.clear_journal()
+
+    def collect_form_data(self):
+        """Collect the current form values, converted to half-width
+
+        A field can still hold full-width text after an undo, which mustn't
+        reach saved or printed data.
+        """
+        form_data, _ = normalizer.normalize_form({
+            "fields": {label: field.text() for label, field in self.form_fields.items()},
+            "looked_items": self.looked_items.values(),
+            "parts_replacement": self.parts_replacement.values()
+        }, {})
+        return form_data
+
+    def rendered_pages(self, form_data, business_info, layout, encoding):
+        """Yield the pages of a form in order, from the render cache or as a worker
+        renders them one page ahead of the printer
+
+        Cached pages are reused but rendered ones aren't added, so a long job
+        doesn't push the preview pages out of the cache.
+        """
+        from PySide6.QtCore import QEventLoop
+
+        pages = [
+            (page_cache_key(page_data, business_info, layout, encoding), page_data)
+            for page_data in form_pages(form_data, layout)
+        ]
+        missing = [(key, page_data) for key, page_data in pages if not self.render_cache.contains(key)]
+        missing_keys = {key for key, _ in missing}
+        task = RenderTask(missing, business_info, layout, encoding, ahead=1)
+        task.setAutoDelete(False)
+        self.output_task = task  # Referenced until the worker is done with it
+        ready = deque()
+        errors = []
+        loop = QEventLoop()
+        task.signals.progress.connect(self.render_progress.setValue)
+        task.signals.page_rendered.connect(lambda _, page_image: (ready.append(page_image), loop.quit()))
+        task.signals.failed.connect(lambda message: (errors.append(message), loop.quit()))
+        self.render_progress.setValue(0)
+        self.render_progress.show()
+        self.statusBar().showMessage("Printing...")
+        if missing:
+            self.render_pool.start(task)
+        try:
+            for key, page_data in pages:
+                if key not in missing_keys:
+                    page_image = self.render_cache.get(key, keep=False)
+                    if page_image is None:  # Evicted since the lookup above
+                        page_image = render_form_page(page_data, business_info, layout, encoding=encoding)
+                    yield page_image
+                    continue
+                # Keep the window responsive while the next page renders
+                while not ready and not errors:
+                    loop.exec()
+                if errors:
+                    raise RuntimeError(errors[0])
+                page_image = ready.popleft()
+                task.release()  # Render the next page while this one is painted
+                yield page_image
+        finally:
+            task.cancel()
+            self.render_progress.hide()
+            self.statusBar().clearMessage()
 
     def handle_paint_request(self, printer):
         """Handle the print preview paint request"""
-        temp_file = None
         try:
-            # Create blank A4 image (3508 x 2480 pixels for 300 DPI)
-            width = 3508  # A4 width at 300 DPI
-            height = 2480  # A4 height at 300 DPI
-            image = Image.new('RGB', (width, height), 'white')
-            draw = ImageDraw.Draw(image)
-
-            # Set up font
-            font_path = "msgothic.ttc"  # Japanese font
-            font = ImageFont.truetype(font_path, 32)
-
-            # Define text positions for main form fields
-            form_coordinates = {
-                "Registration number:": (2910, 130),
-                "Model number:": (2910, 235),
-                "Travel distance:": (2970, 2305),
-                "Checked year:": (2970, 2115),
-                "Checked month:": (3120, 2115),
-                "Checked day:": (3230, 2115),
-                "Maintained year:": (2970, 2210),
-                "Maintained month:": (3120, 2210),
-                "Maintained day:": (3230, 2210)
-            }
+            business_info = {key: preferences.get(key, "") for key, _ in PREFERENCE_ITEMS}
+            layout = current_layout()
+            # Full resolution is only rendered for real output
+            preview = is_preview(printer)
+            if preview and preferences.get("preview_resolution", "screen") == "screen":
+                layout = preview_layout(printer, layout)
+            form_data = self.collect_form_data()
+            backend = preferences.get("print_backend", "raster")
+            encoding = self.raster_encoding()
+            # Output pages come from the cache or are rendered on a worker as the printer
+            # takes them; they aren't cached, they'd push the preview pages out
+            page_images = None
+            if not preview and backend != "vector":
+                page_images = self.rendered_pages(form_data, business_info, layout, encoding)
+            try:
+                with metrics.phase("paint_request.preview" if preview else "paint_request.output"):
+                    paint_form(
+                        printer,
+                        form_data,
+                        business_info,
+                        layout,
+                        backend,
+                        self.render_cache if preview else None,
+                        encoding,
+                        page_images
+                    )
+            finally:
+                if page_images is not None:
+                    page_images.close()
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to print: {str(e)}")
 
-            # Add form field values
-            for label, coord in form_coordinates.items():
-                if label in self.form_fields:
-                    text = self.form_fields[label].text()
-                    draw.text(coord, text, fill="black", font=font)
+def read_form_records(path):
+    """Yield item dicts from a JSONL, Parquet or Feather file, a wide CSV or a per-form Item/Value CSV"""
+    if path.lower().endswith((".parquet", ".feather")):
+        yield from read_columnar_records(path)
+        return
 
-            # Add looked items
-            looked_items_coordinates = [
-                (2800, 541), (2800, 597), (2800, 654), (2800, 710),
-                (2800, 765), (2800, 820), (2800, 876), (2800, 933), (2800, 990)
-            ]
-            for i, (container, field, _) in enumerate(self.looked_items.fields):
-                if container.isVisible() and i < len(looked_items_coordinates):
-                    draw.text(looked_items_coordinates[i], field.text(), fill="black", font=font)
+    if path.lower().endswith((".jsonl", ".json")):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
 
-            # Add parts replacement
-            parts_coordinates = [
-                (2800, 1373), (2800, 1430), (2800, 1486), (2800, 1543), (2800, 1598)
-            ]
-            for i, (container, field, _) in enumerate(self.parts_replacement.fields):
-                if container.isVisible() and i < len(parts_coordinates):
-                    draw.text(parts_coordinates[i], field.text(), fill="black", font=font)
-
-            # Add business information
-            settings = QSettings()
-            business_info = {
-                "business_name": (1515, 2183),
-                "address": (1515, 2232),
-                "phone_number": (1515, 2282),
-                "cellphone_number": (1815, 2282)
-            }
-            for key, coord in business_info.items():
-                text = settings.value(key, "")
-                draw.text(coord, text, fill="black", font=font)
-
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            image.save(temp_file.name)
-            temp_file.close()
-
-            # Draw to printer
-            pixmap = QPixmap(temp_file.name)
-            page_rect = printer.pageRect(QPrinter.DevicePixel)
-            page_size = QSize(int(page_rect.width()), int(page_rect.height()))
-            
-            scaled_pixmap = pixmap.scaled(
-                page_size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header == ['Item', 'Value']:
+            # One form saved by export_csv
+            yield {row[0]: row[1] for row in reader if len(row) >= 2}
+        elif header:
+            # One form per row
+            for row in reader:
+                yield dict(zip(header, row))
+
+# Forms per chunk when streaming bulk files
+BULK_CHUNK_SIZE = 10000
+
+def bulk_columns():
+    """Column order of bulk exports, one row per form"""
+    return (
+        ["Saved at"]
+        + [name for _, name in PREFERENCE_ITEMS]
+        + [label.strip(':') for label in FORM_PLACEHOLDERS]
+        + ["Looked items", "Parts replacements"]
+    )
+
+def bulk_row(form_data, business_info, saved_at=""):
+    """Flatten one form into a bulk export row"""
+    row = {"Saved at": saved_at or ""}
+    for key, name in PREFERENCE_ITEMS:
+        row[name] = business_info.get(key, "")
+    for label in FORM_PLACEHOLDERS:
+        row[label.strip(':')] = form_data["fields"].get(label, "")
+    # Lists are stored whole so any number of items survives the round trip
+    row["Looked items"] = json.dumps(form_data["looked_items"], ensure_ascii=False)
+    row["Parts replacements"] = json.dumps(form_data["parts_replacement"], ensure_ascii=False)
+    return row
+
+def export_forms_bulk(jobs, path, chunk_size=BULK_CHUNK_SIZE):
+    """Stream (form_data, business_info, saved_at) jobs into one Parquet, Feather or CSV file
+
+    Only one chunk of rows is held in memory at a time. Returns the
+    number of forms written.
+    """
+    import pandas as pd
+
+    columns = bulk_columns()
+    extension = os.path.splitext(path)[1].lower()
+    writer = None
+    count = 0
+
+    def write_chunk(rows, first):
+        nonlocal writer
+        frame = pd.DataFrame(rows, columns=columns, dtype=object)
+        if extension == ".csv":
+            frame.to_csv(
+                path, mode='w' if first else 'a', header=first, index=False,
+                encoding='utf-8-sig' if first else 'utf-8', quoting=csv.QUOTE_ALL
             )
-            
-            painter = QPainter()
-            if painter.begin(printer):
-                try:
-                    painter.drawPixmap(0, 0, scaled_pixmap)
-                finally:
-                    painter.end()
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to print: {str(e)}")
-        finally:
-            if temp_file:
-                try:
-                    painter = None
-                    scaled_pixmap = None
-                    pixmap = None
-                    os.unlink(temp_file.name)
-                except:
-                    pass
+        import pyarrow as pa
+        schema = pa.schema([(column, pa.string()) for column in columns])
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        if writer is None:
+            if extension == ".parquet":
+                import pyarrow.parquet as pq
+                writer = pq.ParquetWriter(path, schema)
+            else:
+                writer = pa.ipc.new_file(path, schema)
+        writer.write_table(table)
+
+    try:
+        rows = []
+        for form_data, business_info, saved_at in jobs:
+            rows.append(bulk_row(form_data, business_info, saved_at))
+            if len(rows) >= chunk_size:
+                write_chunk(rows, count == 0)
+                count += len(rows)
+                rows = []
+        if rows or count == 0:
+            write_chunk(rows, count == 0)
+            count += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+def read_columnar_records(path, chunk_size=BULK_CHUNK_SIZE):
+    """Yield item dicts from a Parquet or Feather bulk file one chunk at a time"""
+    import pyarrow as pa
+
+    if path.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+    else:
+        reader = pa.ipc.open_file(path)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+    for batch in batches:
+        yield from batch.to_pandas().to_dict("records")
+
+def batch_output_name(index, form_data):
+    """Build a file-system safe PDF name for a batch record"""
+    registration = form_data["fields"].get("Registration number:", "")
+    safe = "".join("_" if c in '<>:"/\\|?* ' else c for c in registration).strip("_.")
+    return f"{index:05d}_{safe}.pdf" if safe else f"{index:05d}.pdf"
+
+# Keeps the worker process's QApplication alive between records
+batch_app = None
+
+def init_batch_worker():
+    """Start an offscreen Qt application in a batch worker process"""
+    global batch_app
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    QApplication.setOrganizationName(organization_name)
+    QApplication.setApplicationName(app_name)
+    batch_app = QApplication.instance() or QApplication([sys.argv[0]])
+
+def render_batch_record(index, form_data, business_info, output_path, layout_file, backend,
+                        encoding="rgb"):
+    """Write one form to a PDF, returning (index, output_path, error, seconds)"""
+    from PySide6.QtPrintSupport import QPrinter
+
+    start = time.perf_counter()
+    try:
+        printer = create_printer()
+        printer.setOutputFormat(QPrinter.PdfFormat)
+        printer.setOutputFileName(output_path)
+        paint_form(printer, form_data, business_info, load_layout(layout_file), backend,
+                   encoding=encoding)
+        error = None
+    except Exception as e:
+        error = str(e)
+    return index, output_path, error, time.perf_counter() - start
+
+def run_batch(argv):
+    """Render many form records to one PDF each without showing any windows"""
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    parser = argparse.ArgumentParser(
+        prog="carform batch",
+        description="Render form records (CSV/JSONL) to one PDF per record."
+    )
+    parser.add_argument("inputs", nargs="+", help="CSV or JSONL files with form records")
+    parser.add_argument("-o", "--out-dir", default=".", help="Directory for the PDFs")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--backend", choices=["raster", "vector"], help="Print backend (default: preference)")
+    parser.add_argument("--layout", help="Layout template name or file (default: preference)")
+    parser.add_argument(
+        "--encoding", choices=list(RASTER_ENCODINGS), help="Raster page encoding (default: preference)"
+    )
+    args = parser.parse_args(argv)
+
+    QApplication.setOrganizationName(organization_name)
+    QApplication.setApplicationName(app_name)
+    backend = args.backend or preferences.get("print_backend", "raster")
+    encoding = args.encoding or preferences.get("raster_encoding", "rgb")
+    if encoding not in RASTER_ENCODINGS:
+        encoding = "rgb"
+    default_business_info = {key: preferences.get(key, "") for key, _ in PREFERENCE_ITEMS}
+    try:
+        layout_file = layout_path(args.layout or preferences.get("layout_template", "default"))
+        load_layout(layout_file)
+    except (OSError, ValueError) as e:
+        print(f"Invalid layout: {e}", file=sys.stderr)
+        return 2
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    failures = []
+    done = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_batch_worker) as pool:
+        futures = []
+        for input_path in args.inputs:
+            try:
+                for items in read_form_records(input_path):
+                    index = len(futures) + 1
+                    form_data, business_info = normalizer.normalize_form(
+                        *form_data_from_items(items, default_business_info)
+                    )
+                    output_path = os.path.join(args.out_dir, batch_output_name(index, form_data))
+                    futures.append(pool.submit(
+                        render_batch_record, index, form_data, business_info, output_path,
+                        layout_file, backend, encoding
+                    ))
+            except (OSError, ValueError) as e:
+                failures.append((input_path, str(e)))
+                print(f"{input_path}: failed to read records: {e}", file=sys.stderr)
+
+        for future in as_completed(futures):
+            index, output_path, error, _ = future.result()
+            if error:
+                failures.append((index, error))
+                print(f"record {index}: {error}", file=sys.stderr)
+            else:
+                done += 1
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed > 0 else 0
+    print(f"Rendered {done} of {len(futures)} records in {elapsed:.1f}s ({rate:.1f} records/s), "
+          f"{len(failures)} failed")
+    return 1 if failures else 0
+
+def instance_server_name():
+    """Local socket name shared by every launch of the current user"""
+    import getpass
+
+    user = hashlib.sha256(getpass.getuser().encode("utf-8")).hexdigest()[:16]
+    return f"{organization_name}-{app_name}-{user}"
+
+class SingleInstance(QObject):
+    """Hands launch arguments to an already running CarForm over a local socket"""
+    received = Signal(list)
+
+    TIMEOUT_MS = 1000
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.server = None
+
+    def forward(self, args):
+        """Send args to the running instance, returning False if there is none"""
+        from PySide6.QtNetwork import QLocalSocket
+
+        socket = QLocalSocket()
+        socket.connectToServer(self.name)
+        if not socket.waitForConnected(self.TIMEOUT_MS):
+            return False
+        if sys.platform == "win32":
+            # Only the launch the user started may hand the foreground to another process
+            import ctypes
+            ctypes.windll.user32.AllowSetForegroundWindow(-1)  # ASFW_ANY
+        socket.write(json.dumps(args).encode("utf-8") + b"\n")
+        socket.flush()
+        # Wait for the reply so the message isn't lost when this process exits
+        acknowledged = socket.waitForReadyRead(self.TIMEOUT_MS) and socket.canReadLine()
+        socket.disconnectFromServer()
+        return acknowledged
+
+    def listen(self):
+        """Accept later launches, returning False if the socket can't be opened"""
+        from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+        self.server = QLocalServer(self)
+        if not self.server.listen(self.name):
+            # Another first launch may have started listening since forward
+            socket = QLocalSocket()
+            socket.connectToServer(self.name)
+            if socket.waitForConnected(self.TIMEOUT_MS):
+                socket.disconnectFromServer()
+                return False
+            # Nobody is listening, so this is left over from a crashed instance
+            QLocalServer.removeServer(self.name)
+            if not self.server.listen(self.name):
+                return False
+        self.server.newConnection.connect(self.accept)
+        return True
+
+    def accept(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self.read(socket))
+            socket.disconnected.connect(socket.deleteLater)
+            self.read(socket)  # The message may have arrived already
+
+    def read(self, socket):
+        if not socket.canReadLine():
+            return
+        try:
+            args = json.loads(bytes(socket.readLine()).decode("utf-8"))
+        except ValueError:
+            args = None
+        socket.write(b"ok\n")
+        socket.flush()
+        if isinstance(args, list):
+            self.received.emit([str(arg) for arg in args])
 
 if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
+    # Headless batch mode: carform batch records.csv -o out_dir
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(run_batch(sys.argv[2:]))
+    
     # Enable High DPI scaling
     QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     
     app = QApplication(sys.argv)
     
+    # Later launches hand their file to the running window and exit right away
+    QApplication.setOrganizationName(organization_name)
+    QApplication.setApplicationName(app_name)
+    files = [os.path.abspath(arg) for arg in app.arguments()[1:]]
+    instance = SingleInstance(instance_server_name())
+    if instance.forward(files):
+        sys.exit(0)
+    if not instance.listen():
+        # Another first launch started listening in the meantime, hand over to it
+        if instance.forward(files):
+            sys.exit(0)
+        print("Single-instance mode is off: could not listen on the local socket", file=sys.stderr)
+    
     window = CarForm()
+    instance.received.connect(window.open_launch_arguments)
     window.show()
+    # Held back until the journal restore has been answered
+    window.open_launch_arguments(files)
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,20 +1,26 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import glob
+import subprocess
+
 block_cipher = None
 
+# Compile the icon and logos into a module so the onefile build doesn't
+# unpack them to _MEIPASS on every launch
+subprocess.run(['pyside6-rcc', 'carform.qrc', '-o', 'carform_rc.py'], check=True)
+
 a = Analysis(
     ['carform.py'],
     pathex=[],
     binaries=[],
     datas=[
-        # Use forward slashes for paths
-        ('CarForm_amaterasuqbb_icon.ico', '.'),
-        ('Darkmode_CarForm_logo.png', '.'),
-        ('Lightmode_CarForm_logo.png', '.'),
-        ('lgplv3-with-text-154x68.png', '.'),
-        ('PySideLogo1.png', '.')
+        # Every JSON and TOML layout template, with forward slashes. Globbed
+        # here because PyInstaller fails on a pattern that matches nothing
+        (path.replace('\\', '/'), 'layouts')
+        for path in glob.glob('layouts/*.json') + glob.glob('layouts/*.toml')
     ],
-    hiddenimports=['PySide6.QtCore', 'PySide6.QtGui', 'PySide6.QtWidgets'],
+    hiddenimports=['PySide6.QtCore', 'PySide6.QtGui', 'PySide6.QtWidgets', 'PySide6.QtNetwork',
+                   'carform_rc'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],